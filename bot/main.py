@@ -1,4 +1,5 @@
 import asyncio
+import hmac
 import logging
 
 from aiogram import Bot, Dispatcher
@@ -15,11 +16,23 @@ from fluentogram.exceptions import (
     RootTranslatorNotFoundError,
 )
 from src.core import get_logger, setup_logging
-from src.database.core import init_database
-from src.database.repositories.factory import create_repositories
+from src.database.container import database_container
+from src.database.core import get_pool_metrics
 from src.handlers import router as main_router
 from src.middlewares.middlewares import DataBaseMiddleware, TranslateMiddleware
-from src.utils import settings, start_tuna
+from src.services import cancel_background_tasks, run_prewarm_scheduler
+from src.utils import (
+    geo_cache,
+    http_client,
+    parse_executor,
+    provider_breakers,
+    provider_cache,
+    rate_limiter,
+    settings,
+    single_flight,
+    start_tuna,
+    user_write_behind,
+)
 
 storage = MemoryStorage()
 
@@ -37,6 +50,9 @@ WEB_SERVER_PORT = 8080
 # Telegram webhook settings:
 # Path to webhook route, on which Telegram will send requests
 WEBHOOK_PATH = "/webhook"
+# Pool and cache metrics in JSON, only with X-Metrics-Token header
+METRICS_PATH = "/metrics"
+METRICS_TOKEN_HEADER = "X-Metrics-Token"
 # Secret key to validate requests from Telegram (optional)
 WEBHOOK_SECRET = settings.TELEGRAM_WEBHOOK_SECRET
 
@@ -162,11 +178,41 @@ def create_bot() -> Bot | None:
         return None
 
 
+def create_metrics_handler(repos: dict, token: str):
+    """
+    GET handler with DB pool state and Redis value sizes. \n
+    Route is public through the tunnel, without valid token it answers 404.
+    """
+    db_methods = repos["user_repo"].db_methods
+
+    async def metrics_handler(request: web.Request) -> web.Response:
+        provided = request.headers.get(METRICS_TOKEN_HEADER, "")
+        if not hmac.compare_digest(provided.encode(), token.encode()):
+            raise web.HTTPNotFound()
+
+        return web.json_response(
+            {
+                "db_pool": get_pool_metrics(db_methods.engine),
+                "providers": provider_breakers.snapshot(),
+                "http": http_client.get_metrics(),
+                "parse": parse_executor.get_metrics(),
+                "quotas": await rate_limiter.quota_usage(),
+                "cache_sizes": (
+                    db_methods.cache.get_size_metrics()["families"]
+                    if db_methods.cache
+                    else {}
+                ),
+            }
+        )
+
+    return metrics_handler
+
+
 async def run_bot() -> None:
     """Async main app function."""
     repos = None
-    engine = None
     runner = None
+    prewarm_task = None
 
     try:
         _lg.debug("Start main func.")
@@ -176,16 +222,35 @@ async def run_bot() -> None:
             _lg.critical("Failed to create a bot. Exiting.")
             return
 
-        engine, SessionLocal = await init_database()
+        # Воркеры разбора HTML форкаются до запуска остальных потоков
+        await parse_executor.start()
+        await http_client.start()
 
-        repos = await create_repositories(SessionLocal)
+        repos = await database_container.startup()
         _lg.info("Database initialized.")
 
+        # Redis для кеша геокодинга, ответов провайдеров и межрепличных локов
+        geo_cache.bind(repos["user_repo"].db_methods.cache)
+        provider_cache.bind(repos["user_repo"].db_methods.cache)
+        single_flight.bind(repos["user_repo"].db_methods.cache)
+        rate_limiter.bind(repos["user_repo"].db_methods.cache)
+
+        # Пакетная запись пользователей в БД
+        user_write_behind.bind(repos["user_repo"].db_methods, repos["user_repo"].model)
+        if settings.WRITE_BEHIND_ENABLED:
+            await user_write_behind.start()
+
         dp = create_dispatcher(repos)
         if dp is None:
             _lg.critical("Failed to create a dispatcher. Exiting.")
             return
 
+        # Фоновый прогрев кеша погоды
+        if settings.PREWARM_ENABLED:
+            prewarm_task = asyncio.create_task(
+                run_prewarm_scheduler(repos=repos, t_hub=dp["t_hub"])
+            )
+
         # Set webhook
         await on_startup_set_webhook(bot)
 
@@ -198,6 +263,11 @@ async def run_bot() -> None:
             secret_token=WEBHOOK_SECRET,
         )
         webhook_handler.register(app, path=WEBHOOK_PATH)
+        # Без токена метрики не публикуются
+        if settings.METRICS_TOKEN:
+            app.router.add_get(
+                METRICS_PATH, create_metrics_handler(repos, settings.METRICS_TOKEN)
+            )
         setup_application(app, dp, bot=bot)
 
         # Start web server
@@ -225,6 +295,16 @@ async def run_bot() -> None:
         _lg.info("Starting cleanup:")
 
         # Cleanup
+        # Stop pre-warm scheduler
+        if prewarm_task:
+            prewarm_task.cancel()
+            try:
+                await prewarm_task
+            except asyncio.CancelledError:
+                _lg.info("Pre-warm scheduler stopped.")
+            except Exception as e:
+                _lg.error(f"Error stopping pre-warm scheduler: {e}.")
+
         # Stop web server
         if runner:  # type: ignore
             try:
@@ -233,6 +313,12 @@ async def run_bot() -> None:
             except Exception as e:
                 _lg.error(f"Error stopping web server: {e}.")
 
+        # Stop background weather refreshes before HTTP client is closed
+        try:
+            await cancel_background_tasks()
+        except Exception as e:
+            _lg.error(f"Error cancelling background refreshes: {e}.")
+
         # Delete webhook and close bot
         if bot:  # type: ignore
             try:
@@ -247,6 +333,18 @@ async def run_bot() -> None:
             except Exception as e:
                 _lg.error(f"Error closing bot: {e}.")
 
+        # Close shared HTTP client
+        try:
+            await http_client.close()
+        except Exception as e:
+            _lg.error(f"Error closing HTTP client: {e}.")
+
+        # Stop parse workers
+        try:
+            await parse_executor.close()
+        except Exception as e:
+            _lg.error(f"Error closing parse executor: {e}.")
+
         # Close storage
         try:
             await storage.close()
@@ -256,15 +354,15 @@ async def run_bot() -> None:
 
         # Close database
         if repos:  # type: ignore
+            # Flush pending user writes
+            try:
+                await user_write_behind.close()
+            except Exception as e:
+                _lg.error(f"Error flushing user writes: {e}.")
+
             try:
-                # Redis
-                if repos["user_repo"].db_methods.cache:
-                    await repos["user_repo"].db_methods.cache.close()
-                    _lg.info("Redis cache closed.")
-
-                # DB
-                await repos["user_repo"].db_methods.close()
-                _lg.info("Database closed.")
+                # Redis and DB
+                await database_container.shutdown()
             except Exception as e:
                 _lg.error(f"Error closing database: {e}.")
 
@@ -0,0 +1,62 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 12:00:00
+
+Tables as they were created by create_all before migrations.
+Existing databases already have them, so they are created only if missing.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if "user_all_info" not in tables:
+        op.create_table(
+            "user_all_info",
+            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("user_id", sa.BigInteger(), nullable=False),
+            sa.Column("is_bot", sa.Boolean(), nullable=False),
+            sa.Column("is_premium", sa.Boolean(), nullable=True),
+            sa.Column("language_code", sa.String(), nullable=True),
+            sa.Column("supports_inline_queries", sa.Boolean(), nullable=True),
+            sa.Column("username", sa.String(), nullable=True),
+            sa.Column("first_name", sa.String(), nullable=False),
+            sa.Column("last_name", sa.String(), nullable=True),
+            sa.Column("device_type", sa.String(), nullable=True),
+            sa.Column("city", sa.String(), nullable=True),
+            sa.Column("latitude", sa.String(), nullable=True),
+            sa.Column("longitude", sa.String(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    if "weather_all_info" not in tables:
+        op.create_table(
+            "weather_all_info",
+            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("weather_id", sa.String(), nullable=False),
+            sa.Column("weather_now_msg", sa.String(), nullable=True),
+            sa.Column("weather_hours_msg", sa.String(), nullable=True),
+            sa.Column("weather_day_night_msg", sa.String(), nullable=True),
+            sa.Column("weather_5d_msg", sa.String(), nullable=True),
+            sa.Column("weather_rain_msg", sa.String(), nullable=True),
+            sa.Column("weather_wind_pressure_msg", sa.String(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("weather_all_info")
+    op.drop_table("user_all_info")
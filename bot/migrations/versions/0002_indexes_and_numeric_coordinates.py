@@ -0,0 +1,101 @@
+"""indexes and numeric coordinates
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:10:00
+
+Unique indexes on user_all_info.user_id and weather_all_info.weather_id,
+indexes for filtered counts, latitude/longitude as Float
+and composite (latitude, longitude) index for grid lookups.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Строка с числом; остальное (пусто, "Unknown") станет NULL
+_NUMERIC = r"^\s*-?[0-9]+(\.[0-9]+)?\s*$"
+
+_INDEXES = [
+    ("user_all_info", "ix_user_all_info_user_id", ["user_id"], True),
+    ("user_all_info", "ix_user_all_info_is_premium", ["is_premium"], False),
+    ("user_all_info", "ix_user_all_info_language_code", ["language_code"], False),
+    ("user_all_info", "ix_user_all_info_lat_lon", ["latitude", "longitude"], False),
+    ("weather_all_info", "ix_weather_all_info_weather_id", ["weather_id"], True),
+]
+
+
+def _existing_indexes(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def _remove_duplicates(table: str, column: str) -> None:
+    """Keep the first row of every key, unique index can't be built otherwise."""
+    op.execute(
+        f"DELETE FROM {table} WHERE id NOT IN "
+        f"(SELECT MIN(id) FROM {table} GROUP BY {column})"
+    )
+
+
+def _coordinates_to_float() -> None:
+    bind = op.get_bind()
+    columns = {
+        column["name"]: column["type"]
+        for column in sa.inspect(bind).get_columns("user_all_info")
+    }
+    if isinstance(columns["latitude"], sa.Float):
+        return
+
+    if bind.dialect.name == "postgresql":
+        for column in ("latitude", "longitude"):
+            op.alter_column(
+                "user_all_info",
+                column,
+                type_=sa.Float(),
+                existing_type=sa.String(),
+                postgresql_using=(
+                    f"CASE WHEN {column} ~ '{_NUMERIC}' "
+                    f"THEN {column}::double precision END"
+                ),
+            )
+        return
+
+    for column in ("latitude", "longitude"):
+        op.execute(
+            f"UPDATE user_all_info SET {column} = NULL "
+            f"WHERE TRIM({column}) = '' OR TRIM({column}) GLOB '*[^0-9.-]*'"
+        )
+
+    # SQLite пересоздаёт таблицу, значения приводятся через CAST
+    with op.batch_alter_table("user_all_info") as batch_op:
+        batch_op.alter_column("latitude", type_=sa.Float(), existing_type=sa.String())
+        batch_op.alter_column("longitude", type_=sa.Float(), existing_type=sa.String())
+
+
+def upgrade() -> None:
+    _remove_duplicates("user_all_info", "user_id")
+    _remove_duplicates("weather_all_info", "weather_id")
+
+    _coordinates_to_float()
+
+    for table, name, columns, unique in _INDEXES:
+        if name not in _existing_indexes(table):
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade() -> None:
+    for table, name, _, _ in reversed(_INDEXES):
+        if name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
+
+    with op.batch_alter_table("user_all_info") as batch_op:
+        batch_op.alter_column("latitude", type_=sa.String(), existing_type=sa.Float())
+        batch_op.alter_column("longitude", type_=sa.String(), existing_type=sa.Float())
@@ -0,0 +1,46 @@
+"""weather history
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 12:20:00
+
+Weather snapshots moved to Redis with TTL. Optional append-only
+weather_history table, in PostgreSQL partitioned by day on created_at.
+Partitions are created by the bot (ensure_weather_history_partitions).
+weather_all_info is kept for rollback and is no longer written.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if "weather_history" in sa.inspect(bind).get_table_names():
+        return
+
+    op.create_table(
+        "weather_history",
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("weather_id", sa.String(), nullable=False),
+        sa.Column("weather_now_msg", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("created_at", "weather_id"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("weather_history")
@@ -0,0 +1,40 @@
+"""weather history results
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 18:40:00
+
+Weather snapshots are shared by the grid cell and keep only
+locale-neutral provider payloads, the message is rendered per request.
+weather_history gets weather_now_results, weather_now_msg is kept
+for old rows and is no longer written.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    columns = {
+        column["name"] for column in sa.inspect(bind).get_columns("weather_history")
+    }
+    if "weather_now_results" in columns:
+        return
+
+    op.add_column(
+        "weather_history",
+        sa.Column("weather_now_results", sa.JSON(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("weather_history", "weather_now_results")
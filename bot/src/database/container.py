@@ -0,0 +1,73 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from src.core import get_logger
+from src.database.core import database_settings, init_database
+from src.database.repositories.factory import create_repositories
+from src.utils.db_utils import MethodsOfDatabase
+
+_lg = get_logger(__name__)
+
+
+class DatabaseContainer:
+    """
+    Owns the only engine, session factory and repositories of the app. \n
+    startup and shutdown are called once from run_bot.
+    """
+
+    def __init__(self, fast_boot: bool = False):
+        self.fast_boot = fast_boot
+        self.engine: AsyncEngine | None = None
+        self.session_factory: async_sessionmaker | None = None
+        self.repos: dict = {}
+        self._verify_task: asyncio.Task | None = None
+
+    @property
+    def db_methods(self) -> MethodsOfDatabase | None:
+        user_repo = self.repos.get("user_repo")
+        return user_repo.db_methods if user_repo else None
+
+    async def startup(self) -> dict:
+        """Create engine and repositories, verify tables unless fast boot."""
+        initialized = await init_database()
+        if not initialized or initialized[0] is None:
+            raise RuntimeError("Database engine is not initialized.")
+        self.engine, self.session_factory = initialized
+
+        self.repos = await create_repositories(
+            self.session_factory,  # type: ignore
+            self.engine,  # type: ignore
+            verify_tables=not self.fast_boot,
+        )
+
+        if self.fast_boot:
+            # Схемой управляют миграции, проверка таблиц не задерживает старт
+            self._verify_task = asyncio.create_task(
+                self.db_methods.create_tables_and_database()  # type: ignore
+            )
+
+        _lg.info(f"Database container started (fast_boot={self.fast_boot}).")
+        return self.repos
+
+    async def shutdown(self) -> None:
+        """Close Redis connection and dispose the engine pool."""
+        if self._verify_task and not self._verify_task.done():
+            self._verify_task.cancel()
+
+        db_methods = self.db_methods
+        if db_methods is None:
+            return
+
+        try:
+            if db_methods.cache:
+                await db_methods.cache.close()
+                _lg.info("Redis cache closed.")
+        except Exception as e:
+            _lg.error(f"Error closing Redis cache: {e}.")
+
+        await db_methods.close()
+        _lg.info("Database closed.")
+
+
+database_container = DatabaseContainer(fast_boot=database_settings.DB_FAST_BOOT)
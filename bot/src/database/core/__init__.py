@@ -1,4 +1,11 @@
-__all__ = ["database_config", "database"]
+__all__ = ["database_config", "database", "pool_metrics"]
 
-from .database_config import database_settings, DataBaseSettingsSchema, get_engine
+from .database_config import (
+    database_settings,
+    DataBaseSettingsSchema,
+    get_database_url,
+    get_engine,
+    get_engine_options,
+)
+from .pool_metrics import get_pool_metrics, pool_wait_stats
 from .database import init_database
@@ -1,5 +1,9 @@
+from typing import Any
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
+from .pool_metrics import TimedAsyncAdaptedQueuePool
 from src.utils import SettingsSchema
 
 
@@ -22,10 +26,110 @@ class DataBaseSettingsSchema(SettingsSchema):
     REDIS_HOST: str
     REDIS_PORT: str
 
+    # BOOT
+    # Не проверять таблицы при старте (схемой управляет alembic)
+    DB_FAST_BOOT: bool = False
+
+    # POOL
+    # Пул соединений: размер, переполнение, ожидание и пересоздание (секунды)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # ASYNCPG
+    # Кеш подготовленных выражений на соединение и таймаут запроса (секунды)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 256
+    DB_STATEMENT_CACHE_SIZE: int = 256
+    DB_COMMAND_TIMEOUT: float = 30.0
+
+    # SQLITE PRAGMAS
+    SQLITE_BUSY_TIMEOUT: int = 5000
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE: int = -20000
+
 
 database_settings = DataBaseSettingsSchema()  # type: ignore
 
 
+def get_database_url(db_status: str = database_settings.DATABASE_STATUS) -> str:
+    """
+    Database URL for status
+
+    Args:
+        db_status: Database status ('development' or 'product')
+
+    Returns:
+        str: SQLAlchemy async URL
+    """
+    if db_status == "development":
+        return database_settings.SQLITE_DB_URL
+
+    if db_status == "product":
+        return (
+            f"postgresql+"
+            f"{database_settings.POSTGRES_ASYNCPG}"
+            f"://{database_settings.POSTGRES_USER}:"
+            f"{database_settings.POSTGRES_PASSWORD}@"
+            f"{database_settings.POSTGRES_HOST}:"
+            f"{database_settings.POSTGRES_PORT}/"
+            f"{database_settings.POSTGRES_DB}"
+        )
+
+    raise ValueError(f"Unknown database status: {db_status}")
+
+
+def get_engine_options(
+    db_status: str = database_settings.DATABASE_STATUS,
+) -> dict[str, Any]:
+    """
+    Engine profile for status: pool sizing and driver options
+
+    Args:
+        db_status: Database status ('development' or 'product')
+
+    Returns:
+        dict: Keyword arguments of create_async_engine
+    """
+    options: dict[str, Any] = {
+        "poolclass": TimedAsyncAdaptedQueuePool,
+        "pool_size": database_settings.DB_POOL_SIZE,
+        "max_overflow": database_settings.DB_MAX_OVERFLOW,
+        "pool_timeout": database_settings.DB_POOL_TIMEOUT,
+        "pool_recycle": database_settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": database_settings.DB_POOL_PRE_PING,
+    }
+
+    if db_status == "product":
+        options["connect_args"] = {
+            # Кеш подготовленных выражений asyncpg и диалекта SQLAlchemy
+            "statement_cache_size": database_settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": database_settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "command_timeout": database_settings.DB_COMMAND_TIMEOUT,
+        }
+    elif db_status == "development":
+        # SQLite пишет по одному, большой пул только ждёт блокировку
+        options["pool_size"] = 1
+        options["max_overflow"] = 4
+        options["connect_args"] = {
+            "timeout": database_settings.SQLITE_BUSY_TIMEOUT / 1000
+        }
+
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """WAL, busy timeout and cache for every new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={database_settings.SQLITE_BUSY_TIMEOUT}")
+    cursor.execute(f"PRAGMA synchronous={database_settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA cache_size={database_settings.SQLITE_CACHE_SIZE}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
 async def get_engine(db_status=database_settings.DATABASE_STATUS) -> AsyncEngine | None:
     """
     Create async database engine
@@ -42,7 +146,11 @@ async def get_engine(db_status=database_settings.DATABASE_STATUS) -> AsyncEngine
     try:
         if db_status == "development":
             _lg.debug(f"Using SQLite: {database_settings.SQLITE_DB_URL}")
-            return create_async_engine(database_settings.SQLITE_DB_URL)
+            engine = create_async_engine(
+                get_database_url(db_status), **get_engine_options(db_status)
+            )
+            event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+            return engine
 
         elif db_status == "product":
             _lg.debug(f"=== PostgreSQL Connection Details ===")
@@ -53,13 +161,7 @@ async def get_engine(db_status=database_settings.DATABASE_STATUS) -> AsyncEngine
             _lg.debug(f"User: {database_settings.POSTGRES_USER}")
 
             return create_async_engine(
-                f"postgresql+"
-                f"{database_settings.POSTGRES_ASYNCPG}"
-                f"://{database_settings.POSTGRES_USER}:"
-                f"{database_settings.POSTGRES_PASSWORD}@"
-                f"{database_settings.POSTGRES_HOST}:"
-                f"{database_settings.POSTGRES_PORT}/"
-                f"{database_settings.POSTGRES_DB}"
+                get_database_url(db_status), **get_engine_options(db_status)
             )
 
         else:
@@ -0,0 +1,72 @@
+import time
+from typing import Any
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolWaitStats:
+    """Time spent by sessions waiting for a free pooled connection."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": (
+                round(self.wait_total / self.checkouts * 1000, 3)
+                if self.checkouts
+                else 0.0
+            ),
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool which measures connection wait time."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_wait_stats.timeouts += 1
+            raise
+        pool_wait_stats.record(time.perf_counter() - started)
+        return connection
+
+
+def get_pool_metrics(engine: AsyncEngine | None) -> dict[str, Any]:
+    """Pool state of engine: size, checked out and overflow connections, waits."""
+    if engine is None:
+        return {}
+
+    pool = engine.sync_engine.pool
+    metrics: dict[str, Any] = {"pool": type(pool).__name__}
+
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        metrics.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        )
+
+    metrics.update(pool_wait_stats.snapshot())
+    return metrics
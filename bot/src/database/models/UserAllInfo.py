@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, BigInteger, String, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, Float, Index
 
 from src.database.core.database import Base
 
@@ -22,7 +22,11 @@ class UserAllInfo(Base):
     """
 
     __tablename__ = "user_all_info"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Поиск пользователей по сетке координат
+        Index("ix_user_all_info_lat_lon", "latitude", "longitude"),
+        {"extend_existing": True},
+    )
 
     id = Column(
         Integer,
@@ -31,10 +35,11 @@ class UserAllInfo(Base):
         nullable=False,  # NOT NULL
     )
 
-    user_id = Column(BigInteger, nullable=False)
+    # Уникальный индекс нужен для ON CONFLICT (user_id)
+    user_id = Column(BigInteger, nullable=False, unique=True, index=True)
     is_bot = Column(Boolean, nullable=False)
-    is_premium = Column(Boolean)
-    language_code = Column(String)
+    is_premium = Column(Boolean, index=True)
+    language_code = Column(String, index=True)
     supports_inline_queries = Column(Boolean, nullable=True)
 
     username = Column(String)
@@ -43,8 +48,8 @@ class UserAllInfo(Base):
 
     device_type = Column(String)
     city = Column(String)
-    latitude = Column(String)
-    longitude = Column(String)
+    latitude = Column(Float)
+    longitude = Column(Float)
 
     def __repr__(self):
         return f"<User(user_id={self.user_id}, first_name='{self.first_name})'>"
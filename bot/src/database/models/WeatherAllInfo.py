@@ -19,7 +19,7 @@ class WeatherAllInfo(Base):
         nullable=False,  # NOT NULL
     )
 
-    weather_id = Column(String, nullable=False)
+    weather_id = Column(String, nullable=False, unique=True, index=True)
 
     weather_now_msg = Column(String)
     weather_hours_msg = Column(String)
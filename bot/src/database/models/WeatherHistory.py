@@ -0,0 +1,36 @@
+from sqlalchemy import JSON, Column, DateTime, String, Text, func
+
+from src.database.core.database import Base
+
+
+class WeatherHistory(Base):
+    """
+    ## Table name: \n
+    weather_history \n
+    Append-only history of weather snapshots for analytics. \n
+    In PostgreSQL partitioned by day on [ created_at ]. \n
+    ## All Columns: \n
+    [ created_at ][ weather_id ][ weather_now_msg ][ weather_now_results ]
+    """
+
+    __tablename__ = "weather_history"
+    __table_args__ = {
+        "extend_existing": True,
+        "postgresql_partition_by": "RANGE (created_at)",
+    }
+
+    # Ключ партиционирования обязан входить в первичный ключ
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+        nullable=False,
+    )
+    weather_id = Column(String, primary_key=True, nullable=False)
+
+    # Старые строки: отрисованное сообщение, новые пишут только данные провайдеров
+    weather_now_msg = Column(Text)
+    weather_now_results = Column(JSON)
+
+    def __repr__(self):
+        return f"<WeatherHistory(weather_id={self.weather_id}, created_at={self.created_at})>"
@@ -1,4 +1,5 @@
-__all__ = ["UserAllInfo", "WeatherAllInfo"]
+__all__ = ["UserAllInfo", "WeatherAllInfo", "WeatherHistory"]
 
 from .UserAllInfo import UserAllInfo
 from .WeatherAllInfo import WeatherAllInfo
+from .WeatherHistory import WeatherHistory
@@ -43,11 +43,20 @@ class BaseRepository(ABC, Generic[T]):
         pass
 
     async def find_all(
-        self, filters: dict[str, Any] | None = None, limit: int = 100, offset: int = 0
+        self,
+        filters: dict[str, Any] | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        after_id: int | None = None,
     ) -> list[dict[str, Any]]:
         """Find multiple entities with filters."""
-        return self.db_methods.find_users(
-            model=self.model, filters=filters, limit=limit, offset=offset, as_dict=True
+        return await self.db_methods.find_users(
+            model=self.model,
+            filters=filters,
+            limit=limit,
+            offset=offset,
+            after_id=after_id,
+            as_dict=True,
         )  # type: ignore
 
     async def count(self, filters: dict[str, Any] | None = None) -> int:
@@ -1,18 +1,20 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
 
 from src.database.repositories.user_repository import UserRepository
 from src.database.repositories.weather_repository import WeatherRepository
-from src.database.core import init_database
 from src.utils.db_utils import get_database_methods
 from src.database.core.database import Base
 
 
-async def create_repositories(session_factory: async_sessionmaker) -> dict:
-    """Factory function to create all repository instances."""
-    # Инициализация БД
-    engine, SessionLocal = await init_database()
-
-    db_methods = await get_database_methods(SessionLocal, Base, engine)
+async def create_repositories(
+    session_factory: async_sessionmaker,
+    engine: AsyncEngine,
+    verify_tables: bool = True,
+) -> dict:
+    """Factory function to create all repository instances on given engine."""
+    db_methods = await get_database_methods(
+        session_factory, Base, engine, verify_tables=verify_tables
+    )
 
     return {
         "user_repo": UserRepository(db_methods),
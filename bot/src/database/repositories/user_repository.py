@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict
 
 from aiogram.types import User
 
@@ -69,11 +69,42 @@ class UserRepository(BaseRepository[UserAllInfo]):
         if city is not None:
             updates["city"] = city
         if latitude is not None:
-            updates["latitude"] = latitude
+            updates["latitude"] = float(latitude)
         if longitude is not None:
-            updates["longitude"] = longitude
+            updates["longitude"] = float(longitude)
         return await self.update(user_id, updates)
 
+    async def iter_locations(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream city and coordinates of all users with location."""
+        async for users in self.db_methods.iter_users(
+            model=self.model, batch_size=batch_size
+        ):
+            for user in users:
+                if user.get("latitude") and user.get("longitude"):
+                    yield {
+                        "city": user.get("city"),
+                        "latitude": user.get("latitude"),
+                        "longitude": user.get("longitude"),
+                    }
+
+    async def iter_user_ids(self, batch_size: int = 1000) -> AsyncIterator[int]:
+        """Stream all user IDs without loading them into memory."""
+        async for user_id in self.db_methods.iter_user_ids(
+            model=self.model, batch_size=batch_size
+        ):
+            yield user_id
+
+    async def save_many(
+        self, users_data: list[Dict[str, Any]], update_existing: bool = True
+    ) -> int:
+        """Upsert many users, returns number of written rows."""
+        written, _, _ = await self.db_methods.create_many_users(
+            model=self.model, users_data=users_data, update_existing=update_existing
+        )
+        return written
+
     async def get_all_user_ids(self) -> list[int]:
         """Get all user IDs."""
         return await self.db_methods.get_all_user_ids(model=self.model)
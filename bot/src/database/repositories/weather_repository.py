@@ -1,48 +1,108 @@
+import asyncio
+from datetime import date, datetime, timezone
 from typing import Any, Dict
 
-from src.database.models import WeatherAllInfo
+from src.database.models import WeatherHistory
 from src.database.repositories.base import BaseRepository
+from src.utils import settings
 from src.utils.db_utils import MethodsOfDatabase
 
 
-class WeatherRepository(BaseRepository[WeatherAllInfo]):
-    """Repository for WeatherAllInfo entities."""
+class WeatherRepository(BaseRepository[WeatherHistory]):
+    """
+    Weather snapshots store. \n
+    Snapshots live in Redis with native TTL,
+    optional history is appended to WeatherHistory table.
+    """
 
     def __init__(self, db_methods: MethodsOfDatabase):
-        super().__init__(db_methods, WeatherAllInfo)
+        super().__init__(db_methods, WeatherHistory)
+        self._history_tasks: set[asyncio.Task] = set()
+        self._partitions_day: date | None = None
+
+    @property
+    def cache(self):
+        return self.db_methods.cache
 
     async def get_by_id(self, entity_id: str) -> Dict[str, Any] | None:
-        """Get weather cache by ID."""
-        return await self.db_methods.find_weather_cache_by_id(
-            model=self.model, weather_id=entity_id, as_dict=True
-        )
+        """Get weather snapshot by ID."""
+        if not self.cache:
+            return None
+        return await self.cache.get(entity_id)
 
     async def save(self, entity_data: Dict[str, Any]) -> bool:
-        """Save new weather cache."""
-        success, _ = await self.db_methods.create_weather_cache(
-            model=self.model, **entity_data
-        )
+        """Save new weather snapshot."""
+        return await self.save_from_weather_id(**entity_data)
+
+    async def save_from_weather_id(
+        self, weather_id, ex: int | None = None, **kwargs: Any
+    ) -> bool:
+        """Save weather snapshot, it expires in Redis after ex seconds."""
+        if not self.cache:
+            return False
+
+        data = {"weather_id": weather_id, **kwargs}
+        success = await self.cache.set(key=weather_id, data=data, ex=ex)
+
+        if settings.WEATHER_HISTORY_ENABLED:
+            # История не задерживает ответ пользователю
+            task = asyncio.create_task(self._append_history(weather_id, **kwargs))
+            self._history_tasks.add(task)
+            task.add_done_callback(self._history_tasks.discard)
+
         return success
 
-    async def save_from_weather_id(self, weather_id, **kwargs: Any) -> bool:
-        """Save new weather cache from weather_id."""
-        success, _ = await self.db_methods.create_weather_cache(
+    async def _append_history(self, weather_id: str, **kwargs: Any) -> None:
+        today = datetime.now(timezone.utc).date()
+        # При ошибке день не запоминаем, партиции попробуем создать снова
+        if self._partitions_day != today and (
+            await self.db_methods.ensure_weather_history_partitions(
+                model=self.model,
+                day=today,
+                days_ahead=settings.WEATHER_HISTORY_PARTITIONS_AHEAD,
+                retention_days=settings.WEATHER_HISTORY_RETENTION_DAYS,
+            )
+        ):
+            self._partitions_day = today
+
+        await self.db_methods.append_weather_history(
             model=self.model, weather_id=weather_id, **kwargs
         )
-        return success
 
     async def update(self, entity_id: Any, updates: Dict[str, Any]) -> bool:
-        return await super().update(entity_id, updates)
+        """Update fields of weather snapshot, TTL is kept."""
+        if not self.cache or not await self.cache.exists(entity_id):
+            return False
+        await self.cache.update(
+            entity_id, {key: {"new": value} for key, value in updates.items()}
+        )
+        return True
 
     async def delete(self, entity_id: str) -> bool:
-        """Delete weather cache."""
-        success, _ = await self.db_methods.delete_weather_cache_by_id(
-            model=self.model, weather_id=entity_id
-        )
-        return success
+        """Delete weather snapshot."""
+        if not self.cache:
+            return False
+        await self.cache.delete(entity_id)
+        return True
+
+    async def get_stale(
+        self,
+        stale_id: str,
+        stale_age: float,
+        max_stale_age: float,
+    ) -> tuple[Dict[str, Any] | None, bool]:
+        """
+        Get expired weather cache if it is still within hard TTL. \n
+        Returns (weather cache, is_stale).
+        """
+        if stale_age >= max_stale_age:
+            return None, False
+
+        stale = await self.get_by_id(stale_id)
+        return stale, stale is not None
 
     async def exists(self, entity_id: str) -> bool:
-        """Check if weather cache exists."""
-        return await self.db_methods.weather_cache_exists(
-            model=self.model, weather_id=entity_id
-        )
+        """Check if weather snapshot exists."""
+        if not self.cache:
+            return False
+        return await self.cache.exists(entity_id)
@@ -20,6 +20,7 @@ from src.keyboards import (
     get_btns_weather,
     get_btns_weather_now,
 )
+from src.middlewares import UserContext
 from src.services import get_city_from_cord, get_cord_from_city, get_weather_now
 from src.states import LocationState
 from src.utils import clear_state
@@ -35,6 +36,7 @@ async def weather_callback_handler(
     callback_data: WeatherCallback,
     locale: TranslatorRunner,
     repos: Dict[str, Any],
+    user_ctx: UserContext,
 ) -> None:
     """Handle weather menu callbacks"""
 
@@ -52,7 +54,6 @@ async def weather_callback_handler(
 
     message: Message | None = callback.message
     user: User | None = callback.from_user
-    user_repo = repos["user_repo"]
     weather_repo = repos["weather_repo"]
 
     try:
@@ -60,15 +61,13 @@ async def weather_callback_handler(
         if callback_data.action == "weather_menu":
             await message.edit_text(
                 text=locale.message_weather_menu(),
-                reply_markup=await get_btns_weather(
-                    user_id=user.id, locale=locale, user_repo=user_repo
-                ),
+                reply_markup=await get_btns_weather(locale=locale, user_ctx=user_ctx),
             )
 
         # 🌡 Сейчас
         elif callback_data.action == "weather_now":
-            if await user_repo.has_location(user.id):
-                location = await user_repo.get_by_id(user.id)
+            if await user_ctx.has_location():
+                location = await user_ctx.get()
                 latitude = location.get("latitude", None)
                 longitude = location.get("longitude", None)
                 city = location.get("city")
@@ -144,8 +143,8 @@ async def weather_callback_handler(
 
         # 📍 Локация
         elif callback_data.action == "weather_location":
-            if await user_repo.has_location(user.id):
-                location = await user_repo.get_by_id(user.id)
+            if await user_ctx.has_location():
+                location = await user_ctx.get()
 
                 city = location.get("city")
                 latitude = location.get("latitude")
@@ -223,7 +222,10 @@ async def device_callback_handler(
 # LOCATION
 @router.message(LocationState.waiting_for_city_phone, F.location)
 async def handle_location_phone(
-    message: Message, locale: TranslatorRunner, repos: Dict[str, Any], state: FSMContext
+    message: Message,
+    locale: TranslatorRunner,
+    user_ctx: UserContext,
+    state: FSMContext,
 ) -> None:
     """Handle location from phone"""
     try:
@@ -253,8 +255,8 @@ async def handle_location_phone(
 
         _lg.debug(f"User city on phone is - {city}.")
 
-        user_repo = repos["user_repo"]
-        success = await user_repo.update_location(user.id, city, lat, lon)
+        user_ctx.update(city=city, latitude=lat, longitude=lon)
+        success = await user_ctx.flush()
 
         if success:
             _lg.debug(str(success))
@@ -279,7 +281,10 @@ async def handle_location_phone(
 
 @router.message(LocationState.waiting_for_city_pc, F.text)
 async def handle_location_pc(
-    message: Message, locale: TranslatorRunner, repos: Dict[str, Any], state: FSMContext
+    message: Message,
+    locale: TranslatorRunner,
+    user_ctx: UserContext,
+    state: FSMContext,
 ) -> None:
     """Handle location from PC (city name as text)"""
     try:
@@ -312,8 +317,8 @@ async def handle_location_pc(
             )
             return
 
-        lat = cord["lat"]
-        lon = cord["lon"]
+        lat = float(cord["lat"])
+        lon = float(cord["lon"])
 
         # Verify city name via reverse geocoding
         city = await get_city_from_cord(lat, lon)
@@ -324,8 +329,8 @@ async def handle_location_pc(
 
         _lg.debug(f"User city on PC is - {city}.")
 
-        user_repo = repos["user_repo"]
-        success = await user_repo.update_location(user.id, city, lat, lon)
+        user_ctx.update(city=city, latitude=lat, longitude=lon)
+        success = await user_ctx.flush()
 
         if success:
             _lg.debug(str(success))
@@ -12,6 +12,7 @@ from src.keyboards import (
     get_btns_weather,
     get_btns_weather_now,
 )
+from src.middlewares import UserContext
 from src.services import get_weather_now
 
 router = Router()
@@ -23,7 +24,7 @@ _lg = get_logger()
 async def command_start_handler(
     message: Message,
     locale: TranslatorRunner,
-    repos: Dict[str, Any],
+    user_ctx: UserContext,
 ) -> None:
     """Handle /start command and display welcome message"""
     try:
@@ -47,11 +48,8 @@ async def command_start_handler(
             reply_markup=get_btns_start(locale),
         )
 
-        # Создание пользователя в БД
-        user_repo = repos["user_repo"]
-        if not await user_repo.exists(user.id):
-            await user_repo.save_from_telegram_user(user)
-            _lg.debug(f"New user created: {user.id}")
+        # Создание пользователя в БД, запишется после ответа
+        user_ctx.create()
 
     except Exception as e:
         _lg.critical(f"Internal error: {e}.")
@@ -72,11 +70,10 @@ async def command_help_handler(message: Message, locale: TranslatorRunner):
 async def command_weather_handler(
     message: Message,
     locale: TranslatorRunner,
-    repos: Dict[str, Any],
+    user_ctx: UserContext,
 ) -> None:
     """Handle /weatherMenu command"""
     user: User | None = message.from_user
-    user_repo = repos["user_repo"]
 
     if user is None:
         _lg.warning("User is None")
@@ -85,9 +82,7 @@ async def command_weather_handler(
 
     await message.answer(
         text=locale.message_weather_menu(),
-        reply_markup=await get_btns_weather(
-            user_id=user.id, locale=locale, user_repo=user_repo
-        ),
+        reply_markup=await get_btns_weather(locale=locale, user_ctx=user_ctx),
     )
 
 
@@ -97,10 +92,10 @@ async def command_weather_now_handler(
     message: Message,
     locale: TranslatorRunner,
     repos: Dict[str, Any],
+    user_ctx: UserContext,
 ):
     """Handle /weatherNow command"""
     user: User | None = message.from_user
-    user_repo = repos["user_repo"]
     weather_repo = repos["weather_repo"]
 
     if user is None:
@@ -108,8 +103,8 @@ async def command_weather_now_handler(
         await message.answer(locale.message_service_error_not_user_enable())
         return
 
-    if await user_repo.has_location(user.id):
-        location = await user_repo.get_by_id(user.id)
+    if await user_ctx.has_location():
+        location = await user_ctx.get()
         latitude = location.get("latitude", None)
         longitude = location.get("longitude", None)
         city = location.get("city")
@@ -140,19 +135,18 @@ async def command_weather_now_handler(
 async def request_location(
     message: Message,
     locale: TranslatorRunner,
-    repos: Dict[str, Any],
+    user_ctx: UserContext,
 ) -> None:
     """Handle /location command"""
     user: User | None = message.from_user
-    user_repo = repos["user_repo"]
 
     if user is None:
         _lg.warning("User is None")
         await message.answer(locale.message_service_error_not_user_enable())
         return
 
-    if await user_repo.has_location(user.id):
-        location = await user_repo.get_by_id(user.id)
+    if await user_ctx.has_location():
+        location = await user_ctx.get()
 
         city = location.get("city")
         latitude = location.get("latitude")
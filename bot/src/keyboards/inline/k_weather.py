@@ -2,15 +2,14 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from fluentogram import TranslatorRunner
 
-from src.database.repositories import UserRepository
+from src.middlewares import UserContext
 
 from src.filters import WeatherCallback
 
 
 async def get_btns_weather(
-    user_id: int,
     locale: TranslatorRunner,
-    user_repo: UserRepository,
+    user_ctx: UserContext,
 ) -> InlineKeyboardMarkup:
     """Кнопки снизу сообщения после команды /weather."""
 
@@ -57,7 +56,7 @@ async def get_btns_weather(
     )
 
     # 📍 Локация:
-    user_data = await user_repo.get_by_id(user_id)
+    user_data = await user_ctx.get()
     city = user_data.get("city", "Ваша локация") if user_data else "Ваша локация"
     builder.row(
         InlineKeyboardButton(
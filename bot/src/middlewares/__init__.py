@@ -0,0 +1,7 @@
+__all__ = [
+    "DataBaseMiddleware",
+    "TranslateMiddleware",
+    "UserContext",
+]
+
+from .middlewares import DataBaseMiddleware, TranslateMiddleware, UserContext
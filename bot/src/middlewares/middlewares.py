@@ -8,6 +8,7 @@ from cachetools import TTLCache
 from fluentogram import TranslatorHub
 
 from src.core import get_logger
+from src.utils import settings, user_write_behind
 
 caches = {"default": TTLCache(maxsize=10_000, ttl=0.1)}
 _lg = get_logger()
@@ -57,6 +58,84 @@ class TranslateMiddleware(BaseMiddleware):
         return result
 
 
+class UserContext:
+    """
+    Profile of the user of current update. \n
+    Loaded from storage at most once, changed fields are written back
+    by DataBaseMiddleware after the handler.
+    """
+
+    def __init__(self, user_repo: Any, user: User | None):
+        self.user_repo = user_repo
+        self.user = user
+        self._profile: Dict[str, Any] | None = None
+        self._loaded = False
+        self._dirty: Dict[str, Any] = {}
+        self._create = False
+
+    async def get(self) -> Dict[str, Any] | None:
+        """User profile or None if user is not saved yet."""
+        if self.user is None:
+            return None
+
+        if not self._loaded:
+            self._profile = await self.user_repo.get_by_id(self.user.id)
+            self._loaded = True
+
+        return self._profile
+
+    async def exists(self) -> bool:
+        return await self.get() is not None
+
+    async def has_location(self) -> bool:
+        profile = await self.get()
+        if not profile:
+            return False
+        return bool(
+            profile.get("city") or profile.get("latitude") or profile.get("longitude")
+        )
+
+    def update(self, **fields: Any) -> None:
+        """Change profile fields, storage is updated on flush."""
+        self._dirty.update(fields)
+        if self._profile is not None:
+            self._profile.update(fields)
+
+    def create(self) -> None:
+        """Save user on flush if it does not exist yet."""
+        self._create = True
+
+    async def flush(self) -> bool:
+        """
+        Write changed fields, create user if it does not exist yet. \n
+        With write-behind enabled only cache is written here,
+        database gets the change with the next batch.
+        """
+        if self.user is None or not (self._dirty or self._create):
+            return True
+
+        dirty, self._dirty = self._dirty, {}
+        self._create = False
+
+        if await self.exists():
+            if not dirty:
+                return True
+            if settings.WRITE_BEHIND_ENABLED:
+                await user_write_behind.update(self.user.id, **dirty)
+                return True
+            return await self.user_repo.update(self.user.id, dirty)
+
+        if settings.WRITE_BEHIND_ENABLED:
+            await user_write_behind.create(self.user, **dirty)
+            success = True
+        else:
+            success = await self.user_repo.save_from_telegram_user(self.user, **dirty)
+
+        # Перечитаем при следующем обращении
+        self._loaded = False
+        return success
+
+
 class DataBaseMiddleware(BaseMiddleware):  # pylint: disable=too-few-public-methods
     """Data base middleware."""
 
@@ -71,4 +150,17 @@ class DataBaseMiddleware(BaseMiddleware):  # pylint: disable=too-few-public-meth
         data: Dict[str, Any],
     ) -> Any:
         data["repos"] = self.repos
-        return await handler(event, data)
+
+        user_ctx = UserContext(
+            user_repo=self.repos["user_repo"],
+            user=data.get("event_from_user"),
+        )
+        data["user_ctx"] = user_ctx
+
+        try:
+            return await handler(event, data)
+        finally:
+            try:
+                await user_ctx.flush()
+            except Exception as e:
+                _lg.error(f"Failed to flush user context: {e}")
@@ -61,14 +61,10 @@ async def opm_get_weather_now(
             "timezone": "auto",
         }
 
-        req_res = await req_data(url=url, params=params)
-
-        if locale is None:
-            ERROR = "❌ Ошибка: не удалось получить данные от сервиса."  # ! Для теста
-        else:
-            ERROR = (
-                locale.message_service_error_not_found_in_service()
-            )  # ! Для теста без locale, locale=None
+        req_res = await req_data(url=url, params=params, service="OpenMeteo")
+
+        # Ответ кешируется для всех языков: пропуски — None, текст ошибки при отрисовке
+        ERROR = None
 
         current_values = req_res.get("current", ERROR)
         current_units = req_res.get("current_units", ERROR)
@@ -56,14 +56,10 @@ async def vsc_get_weather_now(
             "contentType": "flatjson",
         }
 
-        req_res = await req_data(url=url, params=params)
+        req_res = await req_data(url=url, params=params, service="VisualCrossing")
 
-        if locale is None:
-            ERROR = "❌ Ошибка: не удалось получить данные от сервиса."  # ! Для теста
-        else:
-            ERROR = (
-                locale.message_service_error_not_found_in_service()
-            )  # ! Для теста без locale, locale=None
+        # Ответ кешируется для всех языков: пропуски — None, текст ошибки при отрисовке
+        ERROR = None
 
         current_values = req_res.get("currentConditions", ERROR)
 
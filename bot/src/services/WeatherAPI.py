@@ -53,14 +53,10 @@ async def wapi_get_weather_now(
             "q": f"{latitude},{longitude}",
         }
 
-        req_res = await req_data(url=url, params=params)
-
-        if locale is None:
-            ERROR = "❌ Ошибка: не удалось получить данные от сервиса."  # ! Для теста
-        else:
-            ERROR = (
-                locale.message_service_error_not_found_in_service()
-            )  # ! Для теста без locale, locale=None
+        req_res = await req_data(url=url, params=params, service="WeatherAPI")
+
+        # Ответ кешируется для всех языков: пропуски — None, текст ошибки при отрисовке
+        ERROR = None
 
         location_values = req_res.get("location", ERROR)
         current_values = req_res.get("current", ERROR)
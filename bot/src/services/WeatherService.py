@@ -8,7 +8,10 @@ if __name__ == "__main__":
     sys.path.insert(0, str(bot_dir))
 
 import asyncio
-from datetime import datetime, timedelta
+import time
+from collections import Counter
+from functools import partial
+from typing import Any
 
 from fluentogram import TranslatorRunner
 
@@ -21,9 +24,33 @@ from src.services import (
     wapi_get_weather_now,
     yan_get_weather_now,
 )
+from src.utils import (
+    fan_out,
+    freshness_window,
+    geohash_encode,
+    provider_breakers,
+    provider_cache,
+    settings,
+    single_flight,
+)
 
 _lg = get_logger()
 
+# Провайдеры "Сейчас" в порядке приоритета
+WEATHER_NOW_PROVIDERS = {
+    "YandexParser": yan_get_weather_now,
+    "OpenMeteo": opm_get_weather_now,
+    "WeatherAPI": wapi_get_weather_now,
+    "VisualCrossing": vsc_get_weather_now,
+}
+
+# Фоновые обновления stale-while-revalidate
+_background_tasks: set[asyncio.Task] = set()
+
+# Статистика запросов по ячейкам для прогрева кеша
+request_stats: Counter[str] = Counter()
+cell_locations: dict[str, tuple[str | float, str | float]] = {}
+
 # TODO когда то сделать переключение с м/с на км/ч и тд
 
 
@@ -121,6 +148,12 @@ async def decode_weather_code(locale: TranslatorRunner, code: int) -> str:
     return WEATHER_CODES.get(code, f"{code}")
 
 
+def _value(data: dict, key: str, default: Any) -> Any:
+    """Payload value, missing or None ones are replaced with default."""
+    value = data.get(key)
+    return default if value is None else value
+
+
 async def connect_templates(
     locale: TranslatorRunner, results: dict, sources, temp_unit
 ):
@@ -130,7 +163,7 @@ async def connect_templates(
         sources_text = ""
         for i, source_name in enumerate(sources, 1):
             data = results[source_name]
-            temp = data.get("temp", ERROR)
+            temp = _value(data, "temp", ERROR)
             sources_text += (
                 locale.message_weather_now_source_template(
                     num=i, source_name=source_name, temp=temp, temp_unit=temp_unit
@@ -139,13 +172,13 @@ async def connect_templates(
             )
 
             # Summary
-            weather_code = data.get("weather_code", 404)
+            weather_code = _value(data, "weather_code", 404)
             condition = await decode_weather_code(locale=locale, code=weather_code)
-            feels_like = data.get("feels_like", temp)
-            humidity = data.get("humidity", ERROR)
-            humidity_unit = data.get("humidity_unit", ERROR)
-            wind = data.get("wind", ERROR)
-            wind_unit = data.get("wind_unit", ERROR)
+            feels_like = _value(data, "feels_like", temp)
+            humidity = _value(data, "humidity", ERROR)
+            humidity_unit = _value(data, "humidity_unit", ERROR)
+            wind = _value(data, "wind", ERROR)
+            wind_unit = _value(data, "wind_unit", ERROR)
 
             sources_text += (
                 locale.message_weather_now_summary_template(
@@ -166,6 +199,210 @@ async def connect_templates(
         _lg.error(f"Internal error: {e}")
 
 
+def get_weather_ids(
+    latitude: str | float,
+    longitude: str | float,
+    kind: str = "now",
+    at: float | None = None,
+) -> tuple[str, str, int, float]:
+    """
+    Cache ids of weather snapshot for grid cell of coordinates. \n
+    at - moment in time, default now. \n
+    Returns (weather_id, prev_weather_id, expires_in, window_age).
+    """
+    cell = geohash_encode(
+        latitude=latitude,
+        longitude=longitude,
+        precision=settings.WEATHER_GEOHASH_PRECISION,
+    )
+    ttl = settings.WEATHER_CACHE_TTL
+    now = time.time()
+    at = now if at is None else at
+    index, start = freshness_window(cell=cell, ttl=ttl, now=at)
+
+    weather_id = f"weather:{kind}:{cell}:{index}"
+    prev_weather_id = f"weather:{kind}:{cell}:{index - 1}"
+    expires_in = max(1, int(start + ttl - now))
+
+    return weather_id, prev_weather_id, expires_in, at - start
+
+
+def record_weather_request(
+    latitude: str | float,
+    longitude: str | float,
+) -> None:
+    """Count request of grid cell for pre-warming."""
+    try:
+        cell = geohash_encode(
+            latitude=latitude,
+            longitude=longitude,
+            precision=settings.WEATHER_GEOHASH_PRECISION,
+        )
+        request_stats[cell] += 1
+        cell_locations[cell] = (latitude, longitude)
+    except Exception as e:
+        _lg.error(f"Internal error: {e}")
+
+
+async def get_cached_weather_results(weather_repo, weather_id: str) -> dict | None:
+    """Cached provider payloads of weather snapshot or None."""
+    weather = await weather_repo.get_by_id(weather_id)
+    if weather:
+        return weather.get("weather_now_results")
+    return None
+
+
+def _run_in_background(coro) -> None:
+    """Start task and keep reference until it is done."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def cancel_background_tasks() -> None:
+    """Cancel stale-while-revalidate refreshes and wait for them, called on shutdown."""
+    tasks = list(_background_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if tasks:
+        _lg.info(f"Cancelled {len(tasks)} background weather refreshes.")
+
+
+async def fetch_weather_now_results(
+    locale: TranslatorRunner,
+    latitude: str | float,
+    longitude: str | float,
+    use_cache: bool = True,
+) -> dict:
+    """
+    Normalized "now" payloads of all providers for coordinates. \n
+    Cached payloads of the grid cell are reused, only missing providers are requested.
+    Without use_cache all providers are requested and the cache is refreshed.
+    """
+    cell = geohash_encode(
+        latitude=latitude,
+        longitude=longitude,
+        precision=settings.WEATHER_GEOHASH_PRECISION,
+    )
+
+    cached = (
+        await provider_cache.get_many(list(WEATHER_NOW_PROVIDERS), cell)
+        if use_cache
+        else {}
+    )
+
+    # ! Расположены в порядке сортировки
+    fetched = await fan_out(
+        calls={
+            api_name: partial(
+                get_now,
+                locale=locale,
+                latitude=latitude,
+                longitude=longitude,
+            )
+            for api_name, get_now in WEATHER_NOW_PROVIDERS.items()
+            if api_name not in cached
+        },
+        deadlines=settings.WEATHER_PROVIDER_DEADLINES,
+        default_deadline=settings.WEATHER_PROVIDER_DEADLINE,
+        budget=settings.WEATHER_FANOUT_BUDGET,
+        breakers=provider_breakers,
+    )
+
+    await provider_cache.set_many(fetched, cell)
+
+    return {
+        api_name: cached.get(api_name, fetched.get(api_name))
+        for api_name in WEATHER_NOW_PROVIDERS
+        if api_name in cached or api_name in fetched
+    }
+
+
+async def render_weather_now(
+    locale: TranslatorRunner,
+    city: str | None,
+    results: dict,
+) -> str:
+    """Render weather message from provider payloads, no network calls."""
+    aggregated, sources = await agrregated_weather(results=results)
+
+    ERROR = locale.message_service_error_not_found_in_service()
+
+    temp_unit = aggregated.get("temp_unit", ERROR)
+    avg_temp, avg_filtered = await avg_and_filtered_temp(
+        sources=sources, results=results
+    )
+    day_or_night_emoji = (
+        locale.emoji_weather_now_day()
+        if aggregated.get("is_day")
+        else locale.emoji_weather_now_night()
+    )
+    time = aggregated.get("time", ERROR)
+
+    header = locale.message_weather_now_header(
+        city=city,  # Из бд пользователя
+        time=time,
+        day_or_night_emoji=day_or_night_emoji,
+        avg_temp=avg_temp,
+        temp_unit=temp_unit,
+        avg_filtered=avg_filtered,
+    )
+    sources_text = await connect_templates(
+        locale=locale,
+        results=results,
+        sources=sources,
+        temp_unit=temp_unit,
+    )
+
+    return header + "\n" + sources_text.strip()
+
+
+async def build_weather_now(
+    locale: TranslatorRunner,
+    weather_repo,
+    latitude: str | float,
+    longitude: str | float,
+    weather_id: str,
+    expires_in: int,
+    use_provider_cache: bool = True,
+) -> dict | None:
+    """
+    Fetch all providers and cache their payloads as weather snapshot. \n
+    Snapshot is shared by the grid cell, so it keeps no city or locale,
+    message is rendered for every request.
+    """
+    try:
+        results = await fetch_weather_now_results(
+            locale=locale,
+            latitude=latitude,
+            longitude=longitude,
+            use_cache=use_provider_cache,
+        )
+
+        _lg.debug(f"Results is - {results}")
+
+        # TODO осталось добавить google погоду и возможно open weather map
+
+        if not any(results.values()):
+            _lg.warning("No provider answered in time, weather is not cached.")
+            return results
+
+        # Снимок в Redis, живёт ещё grace после окна для stale-while-revalidate,
+        # прошлое окно истекает само
+        grace = max(0, settings.WEATHER_CACHE_HARD_TTL - settings.WEATHER_CACHE_TTL)
+        await weather_repo.save_from_weather_id(
+            weather_id=weather_id,
+            ex=expires_in + grace,
+            weather_now_results=results,
+        )
+
+        return results
+
+    except Exception as e:
+        _lg.error(f"Internal error: {e}")
+
+
 async def get_weather_now(
     locale: TranslatorRunner,
     weather_repo,
@@ -193,98 +430,49 @@ async def get_weather_now(
             _lg.error(f"Latitude: {latitude}, and Longitude: {longitude}. Error!")
             return None
 
-        ymdhm = datetime.now().strftime("%Y%m%d%H")
-        weather_id = f"{city}{ymdhm}"
+        weather_id, prev_weather_id, expires_in, window_age = get_weather_ids(
+            latitude=latitude, longitude=longitude
+        )
+        record_weather_request(latitude=latitude, longitude=longitude)
 
         # Redis cache
-        if await weather_repo.exists(weather_id):
-            weather_now_msg = await weather_repo.get_by_id(weather_id)
-            return weather_now_msg["weather_now_msg"]
-
-        else:
-            results = {}
-            # ! Расположены в порядке сортировки
-            # YandexParser
-            results["YandexParser"] = await yan_get_weather_now(
-                locale=locale,
-                latitude=latitude,
-                longitude=longitude,
-            )
-
-            # OpenMeteo
-            results["OpenMeteo"] = await opm_get_weather_now(
-                locale=locale,
-                latitude=latitude,
-                longitude=longitude,
-            )
-
-            # WeatherAPI
-            results["WeatherAPI"] = await wapi_get_weather_now(
-                locale=locale,
-                latitude=latitude,
-                longitude=longitude,
-            )
-
-            # VisualCrossing
-            results["VisualCrossing"] = await vsc_get_weather_now(
+        results = await get_cached_weather_results(weather_repo, weather_id)
+        if results is not None:
+            return await render_weather_now(locale=locale, city=city, results=results)
+
+        # Одновременные промахи по одному ключу ждут одно вычисление
+        build = partial(
+            single_flight.do,
+            key=weather_id,
+            fn=partial(
+                build_weather_now,
                 locale=locale,
+                weather_repo=weather_repo,
                 latitude=latitude,
                 longitude=longitude,
-            )
-
-            _lg.debug(f"Results is - {results}")
-
-            # TODO осталось добавить google погоду и возможно open weather map
-
-            aggregated, sources = await agrregated_weather(results=results)
-
-            ERROR = locale.message_service_error_not_found_in_service()
-
-            temp_unit = aggregated.get("temp_unit", ERROR)
-            avg_temp, avg_filtered = await avg_and_filtered_temp(
-                sources=sources, results=results
-            )
-            day_or_night_emoji = (
-                locale.emoji_weather_now_day()
-                if aggregated.get("is_day")
-                else locale.emoji_weather_now_night()
-            )
-            time = aggregated.get("time", ERROR)
-
-            header = locale.message_weather_now_header(
-                city=city,  # Из бд пользователя
-                time=time,
-                day_or_night_emoji=day_or_night_emoji,
-                avg_temp=avg_temp,
-                temp_unit=temp_unit,
-                avg_filtered=avg_filtered,
-            )
-            sources_text = await connect_templates(
-                locale=locale,
-                results=results,
-                sources=sources,
-                temp_unit=temp_unit,
-            )
-
-            weather_now_msg = header + "\n" + sources_text.strip()
-
-            # Удаление старого кеша перед сохранением нового
-            current_hour = datetime.now().replace(minute=0, second=0, microsecond=0)
-            prev_hour = current_hour - timedelta(hours=1)
-            prev_ymdhm = prev_hour.strftime("%Y%m%d%H")
-            prev_weather_id = f"{city}{prev_ymdhm}"
-
-            if await weather_repo.exists(prev_weather_id):
-                await weather_repo.delete(prev_weather_id)
-                _lg.debug(f"Deleted old weather cache: {prev_weather_id}")
-
-            # New Redis cache
-            await weather_repo.save_from_weather_id(
                 weather_id=weather_id,
-                weather_now_msg=weather_now_msg,
-            )
+                expires_in=expires_in,
+            ),
+            recheck=partial(get_cached_weather_results, weather_repo, weather_id),
+        )
+
+        # Stale-while-revalidate: отдаём прошлое окно, обновляем в фоне
+        stale, is_stale = await weather_repo.get_stale(
+            stale_id=prev_weather_id,
+            stale_age=window_age,
+            max_stale_age=settings.WEATHER_CACHE_HARD_TTL - settings.WEATHER_CACHE_TTL,
+        )
+        stale_results = stale.get("weather_now_results") if stale else None
+        if is_stale and stale_results is not None:
+            _lg.debug(f"Serving stale {prev_weather_id}, refreshing {weather_id}.")
+            _run_in_background(build())
+            results = stale_results
+        else:
+            results = await build()
 
-            return weather_now_msg
+        if results is None:
+            return None
+        return await render_weather_now(locale=locale, city=city, results=results)
 
     except Exception as e:
         _lg.error(f"Internal error: {e}")
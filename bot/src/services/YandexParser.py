@@ -16,18 +16,29 @@ from src.core import get_logger
 from src.services import get_cord_from_city
 from src.utils import (
     Language,
+    SelectorTable,
+    extract_fields,
+    find_by_keys,
+    find_state,
+    get_path,
     get_raw_link_api,
-    get_soup,
     headers_factory,
     parse_data,
+    parse_executor,
+    settings,
 )
 
 _lg = get_logger(__name__)
 
+_SELECTORS_PATH = str(
+    settings.YANDEX_SELECTORS_PATH or Path(__file__).parent / "yandex_selectors.json"
+)
+# Таблицы селекторов каждого процесса-воркера
+_selectors: dict[str, SelectorTable] = {}
+
 
-async def _get_is_day(
+def _get_is_day(
     hourly_w: list,
-    ERROR: str,
     now_time: int,
     index_list: list = [
         "Восход",
@@ -35,7 +46,7 @@ async def _get_is_day(
         "Sunrise",
         "Sunset",
     ],
-) -> bool | str | None:
+) -> bool | None:
     try:
         _lg.debug(f"Now_time is - {now_time}")
 
@@ -59,13 +70,145 @@ async def _get_is_day(
         elif now_time > sunrise_time and now_time > sunset_time:
             is_day = False
         else:
-            is_day = ERROR
+            is_day = None
 
         return is_day
     except Exception as e:
         _lg.error(f"Internal error: {e}")
 
 
+def _map_fields(item: dict, mapping: dict[str, str]) -> dict:
+    return {name: get_path(item, path) for name, path in mapping.items()}
+
+
+def _weather_code(conditions: dict[str, int], condition: str | None) -> int:
+    """WMO code of Yandex condition, unknown ones get code 404."""
+    code = conditions.get(condition)  # type: ignore
+    if code is None:
+        _lg.warning(f"Unknown Yandex condition: {condition}")
+        return 404
+    return code
+
+
+def _from_state(html: str, table: SelectorTable) -> dict | None:
+    """Current, hourly and 5-day weather from embedded JSON state."""
+    state = find_state(html, table.state_scripts)
+    if state is None:
+        return None
+
+    spec = table.state
+    conditions = spec.get("conditions", {})
+    fact = find_by_keys(state, spec["fact"]["keys"])
+    if fact is None:
+        return None
+
+    now = _map_fields(fact, spec["fact"]["map"])
+    hours = find_by_keys(state, spec["hourly"]["keys"], many=True) or []
+    days = find_by_keys(state, spec["days"]["keys"], many=True) or []
+
+    hourly = []
+    for item in hours:
+        hour = _map_fields(item, spec["hourly"]["map"])
+        hour["time"] = f"{int(hour.pop('hour')):02d}:00"
+        hour["weather_code"] = _weather_code(conditions, hour.pop("condition"))
+        hourly.append(hour)
+
+    daily = []
+    for item in days[:5]:
+        day = _map_fields(item, spec["days"]["map"])
+        day["weather_code"] = _weather_code(conditions, day.pop("condition"))
+        daily.append(day)
+
+    # Формат совпадает с разбором DOM
+    return {
+        "time": hourly[0]["time"] if hourly else None,
+        "is_day": now["daytime"] == "d",
+        "feels_like": str(now["feels_like"]),
+        "temp": str(now["temp"]),
+        "temp_unit": "°",
+        "wind": str(round(float(now["wind"]))) if now["wind"] is not None else None,
+        "wind_unit": "м/с",
+        "weather_code": _weather_code(conditions, now["condition"]),
+        "humidity": str(now["humidity"]),
+        "humidity_unit": "%",
+        "hourly": hourly,
+        "days": daily,
+    }
+
+
+def extract_weather_now(html: str, selectors_path: str, use_state: bool = True) -> dict:
+    """
+    Current weather from Yandex page. \n
+    Pure sync function for parse_executor, runs in worker.
+    Embedded JSON state is tried first, rendered DOM is the fallback.
+    """
+    table = _selectors.get(selectors_path)
+    if table is None:
+        table = SelectorTable(selectors_path)
+        _selectors[selectors_path] = table
+    table.load()
+
+    if use_state:
+        try:
+            from_state = _from_state(html, table)
+        except (KeyError, TypeError, ValueError) as e:
+            _lg.warning(f"Unexpected Yandex state: {e}")
+            from_state = None
+
+        if from_state is not None:
+            _lg.debug(f"Current_weather_dict from state is - {from_state}.")
+            return from_state
+        _lg.warning("Yandex state not found, using DOM.")
+
+    fields = extract_fields(html, table)
+
+    hourly_w = fields["hourly"]
+    time = hourly_w[0][:5]
+    is_day = _get_is_day(hourly_w, int(time[:2]))
+    feels_like = fields["feels_like"][-4:-1]
+    temp = fields["temperature"][:-1]
+    temp_unit = fields["temperature"][-1:]
+    wphc_list = fields["details"]
+    raw_wind = wphc_list[0].rsplit(",", maxsplit=1)
+    wind = str(round(float(raw_wind[0][:-3].replace(",", "."))))
+    wind_unit = raw_wind[0][-3:].strip()
+    weather_code = fields["warning"]
+    humidity = wphc_list[2][:-1]
+    humidity_unit = wphc_list[2][-1:]
+
+    _lg.debug(f"Fields are - {list(fields)}")
+    _lg.debug(f"Hourly_w is - {bool(hourly_w)}.")
+    _lg.debug(f"Time is - {time}.")
+    _lg.debug(f"Is_day is - {is_day}.")
+    _lg.debug(f"Feels_like is - {feels_like}.")
+    _lg.debug(f"Temp is - {temp}.")
+    _lg.debug(f"Temp_unit is - {temp_unit}.")
+    _lg.debug(f"Wphc_list is - {wphc_list}.")
+    _lg.debug(f"Raw_wind is - {raw_wind}.")
+    _lg.debug(f"Wind is - {wind}.")
+    _lg.debug(f"Wind_unit is - {wind_unit}.")
+    _lg.debug(f"Weather_code is - {weather_code}.")
+    _lg.debug(f"Humidity is - {humidity}.")
+    _lg.debug(f"Humidity_unit is - {humidity_unit}.")
+
+    current_weather_dict = {
+        "time": time,
+        "is_day": is_day,
+        "feels_like": feels_like,
+        "temp": temp,
+        "temp_unit": temp_unit,
+        "wind": wind,
+        "wind_unit": wind_unit,
+        "weather_code": weather_code,
+        "humidity": humidity,
+        "humidity_unit": humidity_unit,
+    }
+
+    _lg.debug(f"Current_weather_dict is - {current_weather_dict}.")
+
+    return current_weather_dict
+
+
 async def yan_get_weather_now(
     locale: TranslatorRunner | None,
     city: str | None = None,
@@ -111,68 +254,16 @@ async def yan_get_weather_now(
             url=url,
             params=params,
             headers=headers,
+            service="YandexParser",
         )
 
-        soup = await get_soup(par_data)
-
-        if soup is None:
-            _lg.debug("Soup is None!!")
-            return None
-
-        if locale is None:
-            ERROR = "❌ Ошибка: не удалось получить данные от сервиса."  # ! Для теста
-        else:
-            ERROR = (
-                locale.message_service_error_not_found_in_service()
-            )  # ! Для теста без locale, locale=None
-
-        scroll_content = soup.find_all("li", class_="AppHourlyItem_container__aqC1z")
-        hourly_w = [i.text for i in scroll_content]
-        time = hourly_w[0][:5]
-        is_day = await _get_is_day(hourly_w, ERROR, int(time[:2]))
-        feels_like = soup.find("span", class_="AppFact_feels__base__bw86b").text[-4:-1]
-        temp = soup.find("p", class_="AppFactTemperature_content__Lx4p9").text[:-1]
-        temp_unit = soup.find("p", class_="AppFactTemperature_content__Lx4p9").text[-1:]
-        raw_wphc = soup.find_all("li", class_="AppFact_details__item__QFIXI")
-        wphc_list = [i.text for i in raw_wphc]
-        raw_wind = wphc_list[0].rsplit(",", maxsplit=1)
-        wind = str(round(float(raw_wind[0][:-3].replace(",", "."))))
-        wind_unit = raw_wind[0][-3:].strip()
-        weather_code = soup.find("p", class_="AppFact_warning__8kUUn").text
-        humidity = wphc_list[2][:-1]
-        humidity_unit = wphc_list[2][-1:]
-
-        _lg.debug(f"Soup is - {bool(soup)}")
-        _lg.debug(f"Scroll_content is - {bool(scroll_content)}")
-        _lg.debug(f"Hourly_w is - {bool(hourly_w)}.")
-        _lg.debug(f"Time is - {time}.")
-        _lg.debug(f"Is_day is - {is_day}.")
-        _lg.debug(f"Feels_like is - {feels_like}.")
-        _lg.debug(f"Temp is - {temp}.")
-        _lg.debug(f"Temp_unit is - {temp_unit}.")
-        _lg.debug(f"Raw_wphc is - {bool(raw_wphc)}.")
-        _lg.debug(f"Wphc_list is - {wphc_list}.")
-        _lg.debug(f"Raw_wind is - {raw_wind}.")
-        _lg.debug(f"Wind is - {wind}.")
-        _lg.debug(f"Wind_unit is - {wind_unit}.")
-        _lg.debug(f"Weather_code is - {weather_code}.")
-        _lg.debug(f"Humidity is - {humidity}.")
-        _lg.debug(f"Humidity_unit is - {humidity_unit}.")
-
-        current_weather_dict = {
-            "time": time,
-            "is_day": is_day,
-            "feels_like": feels_like,
-            "temp": temp,
-            "temp_unit": temp_unit,
-            "wind": wind,
-            "wind_unit": wind_unit,
-            "weather_code": weather_code,
-            "humidity": humidity,
-            "humidity_unit": humidity_unit,
-        }
-
-        _lg.debug(f"Current_weather_dict is - {current_weather_dict}.")
+        # Разбор страницы в пуле, цикл событий свободен для вебхуков
+        current_weather_dict = await parse_executor.run(
+            extract_weather_now,
+            par_data,
+            _SELECTORS_PATH,
+            settings.YANDEX_EXTRACTOR == "state",
+        )
 
         return current_weather_dict
 
@@ -1,4 +1,10 @@
-__all__ = ["cord_and_city", "OpenMeteo", "WeatherService", "YandexParser"]
+__all__ = [
+    "cord_and_city",
+    "OpenMeteo",
+    "WeatherService",
+    "YandexParser",
+    "prewarm",
+]
 
 from .cord_and_city import get_city_from_cord, get_cord_from_city
 from .OpenMeteo import opm_get_weather_now
@@ -6,6 +12,7 @@ from .VisualCrossing import vsc_get_weather_now
 from .WeatherAPI import wapi_get_weather_now
 from .YandexParser import yan_get_weather_now
 from .WeatherService import (
+    cancel_background_tasks,
     get_weather_5d,
     get_weather_day_night,
     get_weather_hours,
@@ -13,3 +20,4 @@ from .WeatherService import (
     get_weather_rain,
     get_weather_wind_pressure,
 )
+from .prewarm import run_prewarm_scheduler
@@ -12,7 +12,7 @@ import asyncio
 import aiohttp
 
 from src.core import get_logger
-from src.utils import get_raw_link_api, req_data
+from src.utils import geo_cache, get_raw_link_api, req_data
 
 _lg = get_logger(__name__)
 
@@ -36,6 +36,12 @@ async def get_city_from_cord(
     try:
         _lg.debug(f"Requesting city name for coordinates: {latitude}, {longitude}")
 
+        cache_key = geo_cache.reverse_key(latitude, longitude)
+        hit, cached_city = await geo_cache.get(cache_key)
+        if hit:
+            _lg.debug(f"City from geo cache: {cached_city}")
+            return cached_city
+
         url = await get_raw_link_api(api_name="Nominatim")
         params = {
             "lat": latitude,
@@ -45,8 +51,13 @@ async def get_city_from_cord(
             "addressdetails": 1,
         }
 
-        data = await req_data(url, params)  # type: ignore
-        address = data.get("address")
+        data = await req_data(url, params, service="Nominatim")  # type: ignore
+
+        # Ошибка запроса не кешируем
+        if data is None:
+            return None
+
+        address = data.get("address") or {}
 
         # Try to get city name in order of priority
         city = (
@@ -62,6 +73,8 @@ async def get_city_from_cord(
         else:
             _lg.warning(f"No city found for coordinates: {latitude}, {longitude}")
 
+        await geo_cache.set(cache_key, city or None)
+
         return city
 
     except asyncio.TimeoutError:
@@ -95,6 +108,15 @@ async def get_cord_from_city(name_city: str | None) -> dict[str, str] | None:
     try:
         _lg.debug(f"Getting coordinates for city: {name_city}")
 
+        if not name_city:
+            return None
+
+        cache_key = geo_cache.forward_key(name_city)
+        hit, cached_cord = await geo_cache.get(cache_key)
+        if hit:
+            _lg.debug(f"Coordinates from geo cache: {cached_cord}")
+            return cached_cord
+
         url = await get_raw_link_api(api_name="Geocoding")
         params = {
             "name": f"{name_city}",
@@ -102,16 +124,22 @@ async def get_cord_from_city(name_city: str | None) -> dict[str, str] | None:
             "format": "json",
         }
 
-        data = await req_data(url, params)  # type: ignore
+        data = await req_data(url, params, service="Geocoding")  # type: ignore
 
         if data is None:
             return None
 
+        if not data.get("results"):
+            _lg.warning(f"City not found: {name_city}")
+            await geo_cache.set(cache_key, None)
+            return None
+
         result = data["results"][0]
         lat = str(result.get("latitude"))
         lon = str(result.get("longitude"))
 
         cord = {"lat": lat, "lon": lon}
+        await geo_cache.set(cache_key, cord)
 
         _lg.debug(f"Retrieved coordinates for {name_city}: {cord}")
         return cord
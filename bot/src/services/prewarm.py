@@ -0,0 +1,166 @@
+import asyncio
+import time
+from collections import Counter
+
+from fluentogram import TranslatorHub
+
+from src.core import get_logger
+from src.services.WeatherService import (
+    build_weather_now,
+    cell_locations,
+    get_weather_ids,
+    request_stats,
+)
+from src.utils import geohash_encode, settings, single_flight
+
+_lg = get_logger(__name__)
+
+# Вес одного запроса пользователя относительно одной сохранённой локации
+REQUEST_WEIGHT = 3
+
+
+async def get_hot_cells(
+    user_cells: Counter[str],
+    top: int,
+) -> list[str]:
+    """Most popular grid cells by stored user locations and recent requests."""
+    scores = Counter(user_cells)
+    for cell, count in request_stats.items():
+        scores[cell] += count * REQUEST_WEIGHT
+
+    return [cell for cell, _ in scores.most_common(top)]
+
+
+async def decay_request_stats() -> None:
+    """Halve request counters, so stats follow recent traffic."""
+    for cell in list(request_stats):
+        request_stats[cell] //= 2
+        if request_stats[cell] <= 0:
+            del request_stats[cell]
+
+
+async def load_user_cells(user_repo) -> Counter[str]:
+    """Count users per grid cell, remember one location for every cell."""
+    user_cells: Counter[str] = Counter()
+
+    async for location in user_repo.iter_locations():
+        latitude = location["latitude"]
+        longitude = location["longitude"]
+        cell = geohash_encode(
+            latitude=latitude,
+            longitude=longitude,
+            precision=settings.WEATHER_GEOHASH_PRECISION,
+        )
+        user_cells[cell] += 1
+        cell_locations.setdefault(cell, (latitude, longitude))
+
+    _lg.debug(
+        f"Loaded {sum(user_cells.values())} locations in {len(user_cells)} cells."
+    )
+    return user_cells
+
+
+async def prewarm_cell(cell: str, locale, weather_repo) -> bool:
+    """
+    Build weather of cell before users ask for it. \n
+    Near the end of window the next window is built ahead
+    from fresh provider data, bypassing the provider cache.
+    """
+    latitude, longitude = cell_locations[cell]
+
+    weather_id, _, expires_in, _ = get_weather_ids(
+        latitude=latitude, longitude=longitude
+    )
+
+    if expires_in <= settings.PREWARM_LEAD:
+        # Следующее окно, текущее не трогаем
+        next_weather_id, _, next_expires_in, _ = get_weather_ids(
+            latitude=latitude,
+            longitude=longitude,
+            at=time.time() + settings.WEATHER_CACHE_TTL,
+        )
+        target_id = next_weather_id
+        target_expires_in = next_expires_in
+        # Снимок проживёт всё следующее окно, данные провайдеров берём свежие
+        use_provider_cache = False
+    elif not await weather_repo.exists(weather_id):
+        target_id = weather_id
+        target_expires_in = expires_in
+        use_provider_cache = True
+    else:
+        return False
+
+    if await weather_repo.exists(target_id):
+        return False
+
+    _lg.debug(f"Pre-warming {target_id}.")
+    await single_flight.do(
+        key=target_id,
+        fn=lambda: build_weather_now(
+            locale=locale,
+            weather_repo=weather_repo,
+            latitude=latitude,
+            longitude=longitude,
+            weather_id=target_id,
+            expires_in=target_expires_in,
+            use_provider_cache=use_provider_cache,
+        ),
+    )
+    return True
+
+
+async def run_prewarm_scheduler(repos: dict, t_hub: TranslatorHub) -> None:
+    """
+    Background task started from run_bot. \n
+    Refreshes weather of hottest grid cells ahead of expiry.
+    Concurrency and pace are limited to respect provider rate limits.
+    """
+    locale = t_hub.get_translator_by_locale(settings.PREWARM_LOCALE)
+    user_repo = repos["user_repo"]
+    weather_repo = repos["weather_repo"]
+
+    semaphore = asyncio.Semaphore(settings.PREWARM_CONCURRENCY)
+    user_cells: Counter[str] = Counter()
+    users_loaded_at = 0.0
+
+    async def limited(cell: str) -> bool:
+        async with semaphore:
+            try:
+                warmed = await prewarm_cell(cell, locale, weather_repo)
+            except Exception as e:
+                _lg.error(f"Failed to pre-warm {cell}: {e}")
+                return False
+
+            # Равномерный темп запросов к провайдерам
+            if warmed:
+                await asyncio.sleep(settings.PREWARM_CALL_INTERVAL)
+            return warmed
+
+    _lg.info("Pre-warm scheduler started.")
+
+    while True:
+        try:
+            if (
+                time.monotonic() - users_loaded_at
+                >= settings.PREWARM_USERS_SCAN_INTERVAL
+            ):
+                user_cells = await load_user_cells(user_repo)
+                users_loaded_at = time.monotonic()
+
+            hot_cells = await get_hot_cells(user_cells, settings.PREWARM_TOP_CELLS)
+
+            warmed = await asyncio.gather(*(limited(cell) for cell in hot_cells))
+            _lg.debug(f"Pre-warmed {sum(warmed)} of {len(hot_cells)} hot cells.")
+
+            await decay_request_stats()
+            for cell in list(cell_locations):
+                if cell not in request_stats and cell not in user_cells:
+                    del cell_locations[cell]
+
+        except asyncio.CancelledError:
+            _lg.info("Pre-warm scheduler stopped.")
+            raise
+        except Exception as e:
+            _lg.error(f"Internal error: {e}")
+
+        await asyncio.sleep(settings.PREWARM_INTERVAL)
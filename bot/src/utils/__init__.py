@@ -2,19 +2,49 @@ __all__ = [
     "config",
     "db_utils",
     "cache",
+    "codec",
     "save_load_delete",
     "start_tuna",
     "state_helpers",
     "api_helper",
     "parser",
+    "parse_executor",
+    "fan_out",
+    "circuit_breaker",
+    "http_client",
+    "rate_limiter",
+    "geo",
+    "geo_cache",
+    "single_flight",
+    "provider_cache",
+    "write_behind",
 ]
 
 from .config import SettingsSchema, settings
+from .http_client import HttpClient, http_client
+from .rate_limiter import RateLimiter, RateLimitExceeded, rate_limiter
 from .api_helper import get_raw_link_api, req_data
+from .codec import Codec
 from .cache import RedisCache
+from .geo import freshness_window, geohash_encode, normalize_city, quantize_cord
+from .geo_cache import GeoCache, geo_cache
+from .single_flight import SingleFlight, single_flight
+from .provider_cache import ProviderCache, provider_cache
+from .circuit_breaker import CircuitBreaker, CircuitBreakers, provider_breakers
+from .fan_out import fan_out
 from .auto_tuna_tunnel import start_tuna
 from .db_utils import MethodsOfDatabase, get_database_methods
+from .write_behind import UserWriteBehind, user_write_behind
 from .headers import Browser, Language, Platform, headers_factory
 from .save_load_delete import load_from_file, save_to_file
-from .parser import get_soup, parse_data
+from .parser import (
+    SelectorTable,
+    extract_fields,
+    find_by_keys,
+    find_state,
+    get_path,
+    get_soup,
+    parse_data,
+)
+from .parse_executor import ParseExecutor, parse_executor
 from .state_helpers import *
@@ -12,6 +12,8 @@ if __name__ == "__main__":
 import aiohttp
 
 from src.core import get_logger
+from src.utils.http_client import http_client
+from src.utils.rate_limiter import rate_limiter
 
 _lg = get_logger(__name__)
 
@@ -61,21 +63,33 @@ async def req_data(
     url: str | dict,
     params: dict,
     headers: dict | None = None,
+    service: str | None = None,
 ) -> Any | None:
-    """Request data from api."""
+    """
+    Request data from api through shared http_client. \n
+    Returns None if request is shed by rate limiter.
+    """
     try:
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=10)
-        ) as session:  # TODO добавить ключи доступа, если нужны будут
+        if not await rate_limiter.acquire(url):
+            return None
+
+        session = await http_client.get_session()
+
+        async def fetch() -> Any:
             async with session.get(
                 url,  # type: ignore
                 headers=headers,
                 params=params,
-            ) as response:  # headers=headers
+                timeout=http_client.get_timeout(service),
+            ) as response:  # TODO добавить ключи доступа, если нужны будут
                 response.raise_for_status()
-                data = await response.json()
+                return await response.json()
+
+        data = await http_client.hedge(
+            service, fetch, gate=lambda: rate_limiter.try_acquire(url)
+        )
 
-                return data
+        return data
 
     except asyncio.TimeoutError as e:
         _lg.error(f"API request timeout: {e}")
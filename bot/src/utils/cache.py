@@ -1,10 +1,13 @@
-import pickle
+import asyncio
 import redis.asyncio
 from typing import Any
+from cachetools import TTLCache
 from dotenv import load_dotenv
 import os
 
 from src.core import get_logger
+from src.utils.codec import Codec
+from src.utils.config import settings
 
 
 class RedisCache:
@@ -35,6 +38,17 @@ class RedisCache:
         self.db = db
         self.decode_responses = decode_responses
         self.connection: redis.asyncio.Redis | None = None
+        self.codec = Codec(
+            fmt=settings.CACHE_CODEC,
+            compression=settings.CACHE_COMPRESSION,
+            compress_threshold=settings.CACHE_COMPRESS_THRESHOLD,
+        )
+
+        # L1 кеш хешей в памяти процесса, инвалидируется через pub/sub
+        self.l1: TTLCache | None = None
+        self._l1_listener: asyncio.Task | None = None
+        # Поколения ключей, которые сейчас читаются из Redis: (поколение, читатели)
+        self._l1_reads: dict[Any, tuple[int, int]] = {}
 
     async def connect(self) -> None:
         """Connect to Redis server (async)."""
@@ -52,8 +66,92 @@ class RedisCache:
             self._lg.error(f"Failed to connect to Redis: {e}")
             self.connection = None
 
+    async def enable_l1(self, maxsize: int = 10_000, ttl: float = 60.0) -> None:
+        """
+        Enable in-process L1 cache for hashes. \n
+        Writes of other replicas invalidate it through Redis pub/sub.
+        """
+        if self.connection is None:
+            self._lg.warning("Redis connection not established, L1 is disabled")
+            return
+
+        self.l1 = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._l1_listener = asyncio.create_task(self._listen_invalidations())
+        self._lg.info(f"L1 cache enabled (maxsize={maxsize}, ttl={ttl}s)")
+
+    async def _listen_invalidations(self) -> None:
+        """Drop L1 entries of keys written by any replica."""
+        while True:
+            try:
+                async with self.connection.pubsub() as pubsub:  # type: ignore
+                    await pubsub.subscribe(settings.CACHE_L1_CHANNEL)
+
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        key = message["data"]
+                        if isinstance(key, bytes):
+                            key = key.decode()
+                        self._l1_drop(key)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._lg.error(f"L1 invalidation listener error: {e}")
+                # Пока нет подписки, L1 может быть устаревшим
+                self.l1.clear()  # type: ignore
+                for key in self._l1_reads:
+                    self._l1_drop(key)
+                await asyncio.sleep(1)
+
+    def _l1_drop(self, key: Any) -> None:
+        """Drop key from L1, reads of key in flight will not fill it."""
+        self.l1.pop(key, None)  # type: ignore
+        if key in self._l1_reads:
+            generation, readers = self._l1_reads[key]
+            self._l1_reads[key] = (generation + 1, readers)
+
+    def _l1_read_started(self, key: Any) -> int:
+        generation, readers = self._l1_reads.get(key, (0, 0))
+        self._l1_reads[key] = (generation, readers + 1)
+        return generation
+
+    def _l1_read_finished(self, key: Any, generation: int, result: Any) -> None:
+        """Fill L1 only if key was not invalidated while it was read."""
+        entry = self._l1_reads.get(key)
+        if entry is None:
+            return
+
+        current, readers = entry
+        if result is not None and current == generation:
+            self.l1[key] = result  # type: ignore
+
+        if readers == 1:
+            del self._l1_reads[key]
+        else:
+            self._l1_reads[key] = (current, readers - 1)
+
+    async def _invalidate(self, key: Any) -> None:
+        """Drop key from local L1 and notify other replicas."""
+        if self.l1 is None:
+            return
+
+        self._l1_drop(key)
+        try:
+            await self.connection.publish(settings.CACHE_L1_CHANNEL, key)  # type: ignore
+        except Exception as e:
+            self._lg.error(f"Failed to publish invalidation of {key}: {e}")
+
     async def close(self) -> None:
         """Close Redis connection."""
+        if self._l1_listener:
+            self._l1_listener.cancel()
+            try:
+                await self._l1_listener
+            except asyncio.CancelledError:
+                pass
+            self._l1_listener = None
+
         if self.connection:
             try:
                 await self.connection.aclose()
@@ -61,24 +159,37 @@ class RedisCache:
             except Exception as e:
                 self._lg.error(f"Error closing Redis connection: {e}")
 
-    def serialize_data(self, data: Any) -> bytes | None:
-        """Serialize data using pickle."""
+    def serialize_data(self, data: Any, key: Any = None) -> bytes | None:
+        """Serialize data using versioned codec."""
         try:
-            return pickle.dumps(data)
+            return self.codec.encode(data, key=key)
         except Exception as e:
             self._lg.error(f"Failed to serialize data: {e}")
 
     def deserialize_data(self, data: bytes | None) -> Any:
-        """Deserialize data using pickle."""
+        """
+        Deserialize data using versioned codec. \n
+        Legacy (pickle) values are treated as cache miss.
+        """
         if data is None:
             return None
         try:
-            return pickle.loads(data)
+            return self.codec.decode(data)
         except Exception as e:
-            self._lg.error(f"Failed to deserialize data: {e}")
+            self._lg.debug(f"Failed to deserialize data: {e}")
             return None
 
-    async def set(self, key: Any, data: Any, ex: int | None = None) -> None:
+    def get_size_metrics(self) -> dict[str, Any]:
+        """Sizes of written values per key family and per recent key."""
+        return self.codec.metrics.snapshot()
+
+    async def set(
+        self,
+        key: Any,
+        data: Any,
+        ex: int | None = None,
+        keepttl: bool = False,
+    ) -> bool:
         """
         Cache data in Redis.
 
@@ -86,17 +197,27 @@ class RedisCache:
             key: Cache key
             data: Data to cache
             ex: Expiration time in seconds (optional)
+            keepttl: Keep current TTL of key instead of ex
+
+        Returns:
+            bool: True if data was cached
         """
         if self.connection is None:
             self._lg.warning("Redis connection not established")
-            return
+            return False
 
         try:
-            serialized = self.serialize_data(data)
-            await self.connection.set(key, serialized, ex=ex)
+            serialized = self.serialize_data(data, key=key)
+            if serialized is None:
+                return False
+            await self.connection.set(
+                key, serialized, ex=None if keepttl else ex, keepttl=keepttl
+            )
             self._lg.debug(f"Successfully cached data for key: {key}")
+            return True
         except Exception as e:
             self._lg.error(f"Failed to cache data for key {key}: {e}")
+            return False
 
     async def get(self, key: Any) -> Any:
         """Get cached data from Redis."""
@@ -116,6 +237,22 @@ class RedisCache:
             self._lg.error(f"Failed to get cached data for key {key}: {e}")
             return None
 
+    async def get_many(self, keys: list[Any]) -> list[Any]:
+        """Get cached data for several keys in one round trip."""
+        if self.connection is None:
+            self._lg.warning("Redis connection not established")
+            return [None] * len(keys)
+
+        if not keys:
+            return []
+
+        try:
+            cached_data = await self.connection.mget(keys)
+            return [self.deserialize_data(data) for data in cached_data]
+        except Exception as e:
+            self._lg.error(f"Failed to get cached data for keys {keys}: {e}")
+            return [None] * len(keys)
+
     async def update(self, key: Any, updated_fields: dict[str, dict]) -> None:
         """
         Update specific fields in cached data.
@@ -131,18 +268,144 @@ class RedisCache:
         try:
             cached_data = await self.get(key)
             if cached_data is None:
-                cached_data = {}
+                # Нет полной записи — не пишем частичную, её заполнит чтение из БД
+                self._lg.debug(f"No cached data to update for key: {key}")
+                return
 
             for field, changes in updated_fields.items():
                 cached_data[field] = changes["new"]
 
-            await self.set(key, cached_data)
+            # TTL записи сохраняется
+            await self.set(key, cached_data, keepttl=True)
             self._lg.debug(
                 f"Updated cache for key {key}: {list(updated_fields.keys())}"
             )
         except Exception as e:
             self._lg.error(f"Failed to update cache for key {key}: {e}")
 
+    # ==== Hash Methods ====
+    # HSET только если хеш уже есть, иначе частичная запись
+    _HSET_IF_EXISTS = """
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        return redis.call('HSET', KEYS[1], unpack(ARGV))
+    end
+    return -1
+    """
+
+    def _encode_fields(self, fields: dict[str, Any]) -> dict[str, bytes]:
+        return {field: self.codec.encode(value) for field, value in fields.items()}
+
+    async def hset_fields(
+        self, key: Any, fields: dict[str, Any], ex: int | None = None
+    ) -> None:
+        """
+        Write fields of hash in one pipeline.
+
+        Args:
+            key: Cache key
+            fields: Dict of {field: value}
+            ex: Expiration time in seconds (optional)
+        """
+        if self.connection is None:
+            self._lg.warning("Redis connection not established")
+            return
+
+        if not fields:
+            return
+
+        try:
+            encoded = self._encode_fields(fields)
+            async with self.connection.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping=encoded)  # type: ignore
+                if ex is not None:
+                    pipe.expire(key, ex)
+                await pipe.execute()
+            await self._invalidate(key)
+
+            self.codec.metrics.record(
+                key,
+                sum(len(value) - 3 for value in encoded.values()),
+                sum(len(value) for value in encoded.values()),
+            )
+            self._lg.debug(f"Successfully cached hash for key: {key}")
+        except Exception as e:
+            self._lg.error(f"Failed to cache hash for key {key}: {e}")
+
+    async def hupdate_if_exists(self, key: Any, fields: dict[str, Any]) -> bool:
+        """Atomically update fields of existing hash, missing hash is left as is."""
+        if self.connection is None:
+            self._lg.warning("Redis connection not established")
+            return False
+
+        if not fields:
+            return False
+
+        try:
+            args = []
+            for field, value in self._encode_fields(fields).items():
+                args.extend((field, value))
+
+            result = await self.connection.eval(self._HSET_IF_EXISTS, 1, key, *args)  # type: ignore
+            await self._invalidate(key)
+            updated = result != -1
+            self._lg.debug(f"Hash {key} updated: {updated}, fields: {list(fields)}")
+            return updated
+        except Exception as e:
+            self._lg.error(f"Failed to update hash for key {key}: {e}")
+            return False
+
+    async def hget_all(self, key: Any) -> dict[str, Any] | None:
+        """Get all fields of hash or None if it is missing."""
+        if self.connection is None:
+            self._lg.warning("Redis connection not established")
+            return None
+
+        if self.l1 is not None and key in self.l1:
+            return dict(self.l1[key])
+
+        result = None
+        generation = self._l1_read_started(key) if self.l1 is not None else 0
+        try:
+            cached_data = await self.connection.hgetall(key)  # type: ignore
+            if not cached_data:
+                self._lg.debug(f"No cached hash found for key: {key}")
+                return None
+
+            result = {
+                field.decode(): self.deserialize_data(value)
+                for field, value in cached_data.items()
+            }
+            return dict(result)
+        except Exception as e:
+            self._lg.error(f"Failed to get cached hash for key {key}: {e}")
+            return None
+        finally:
+            if self.l1 is not None:
+                self._l1_read_finished(key, generation, result)
+
+    async def hget_fields(self, key: Any, fields: list[str]) -> dict[str, Any] | None:
+        """Get only requested fields of hash or None if it is missing."""
+        if self.connection is None:
+            self._lg.warning("Redis connection not established")
+            return None
+
+        if self.l1 is not None and key in self.l1:
+            cached_hash = self.l1[key]
+            return {field: cached_hash.get(field) for field in fields}
+
+        try:
+            values = await self.connection.hmget(key, fields)  # type: ignore
+            if all(value is None for value in values):
+                return None
+
+            return {
+                field: self.deserialize_data(value)
+                for field, value in zip(fields, values)
+            }
+        except Exception as e:
+            self._lg.error(f"Failed to get cached fields for key {key}: {e}")
+            return None
+
     async def delete(self, key: Any) -> None:
         """Delete cached data."""
         if self.connection is None:
@@ -151,16 +414,39 @@ class RedisCache:
 
         try:
             await self.connection.delete(key)
+            await self._invalidate(key)
             self._lg.debug(f"Successfully deleted cached data for key: {key}")
         except Exception as e:
             self._lg.error(f"Failed to delete cached data for key {key}: {e}")
 
+    async def delete_many(self, keys: list[Any]) -> None:
+        """Delete many keys with one command."""
+        if self.connection is None or not keys:
+            return
+
+        try:
+            await self.connection.delete(*keys)
+
+            if self.l1 is not None:
+                async with self.connection.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        self._l1_drop(key)
+                        pipe.publish(settings.CACHE_L1_CHANNEL, key)
+                    await pipe.execute()
+
+            self._lg.debug(f"Successfully deleted {len(keys)} cached keys")
+        except Exception as e:
+            self._lg.error(f"Failed to delete cached keys: {e}")
+
     async def exists(self, key: Any) -> bool:
         """Check if key exists in cache."""
         if self.connection is None:
             self._lg.warning("Redis connection not established")
             return False
 
+        if self.l1 is not None and key in self.l1:
+            return True
+
         try:
             result = await self.connection.exists(key)
             return bool(result)
@@ -0,0 +1,159 @@
+import time
+from collections import deque
+from typing import Any
+
+from src.core import get_logger
+from src.utils.config import settings
+
+_lg = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one upstream over rolling window of calls. \n
+    Opens when error or slow-call rate is too high, after open time
+    lets a few probes through (half-open) and closes on their success.
+    Every failed probe doubles open time up to max_open_time.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: float = 60.0,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        slow_call: float = 3.0,
+        slow_rate: float = 0.8,
+        open_time: float = 30.0,
+        max_open_time: float = 300.0,
+        half_open_probes: int = 1,
+    ):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call = slow_call
+        self.slow_rate = slow_rate
+        self.base_open_time = open_time
+        self.max_open_time = max_open_time
+        self.half_open_probes = half_open_probes
+
+        self.state = CLOSED
+        self.open_time = open_time
+        self.opened_at = 0.0
+        self._probes = 0
+        self._probe_started = 0.0
+        # (время, успех, задержка)
+        self._calls: deque[tuple[float, bool, float]] = deque()
+
+    def _trim(self, now: float) -> None:
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+
+    def allow(self) -> bool:
+        """May the next call go to upstream."""
+        if self.state == CLOSED:
+            return True
+
+        now = time.monotonic()
+        if self.state == OPEN:
+            if now - self.opened_at < self.open_time:
+                return False
+            self.state = HALF_OPEN
+            self._probes = 0
+            _lg.info(f"Circuit {self.name} half-open, probing.")
+
+        # Пробные запросы по одному; потерянная проба не блокирует навсегда
+        if self._probes >= self.half_open_probes:
+            if now - self._probe_started < self.window:
+                return False
+            self._probes = 0
+        self._probes += 1
+        self._probe_started = now
+        return True
+
+    def record(self, success: bool, latency: float) -> None:
+        """Record result of call allowed by allow()."""
+        now = time.monotonic()
+
+        if self.state == HALF_OPEN:
+            if success and latency < self.slow_call:
+                self._close()
+            else:
+                self._open(now, backoff=True)
+            return
+
+        self._calls.append((now, success, latency))
+        self._trim(now)
+
+        calls = len(self._calls)
+        if self.state == CLOSED and calls >= self.min_calls:
+            errors = sum(not ok for _, ok, _ in self._calls) / calls
+            slow = sum(lat >= self.slow_call for _, _, lat in self._calls) / calls
+            if errors >= self.error_rate or slow >= self.slow_rate:
+                self._open(now)
+
+    def _open(self, now: float, backoff: bool = False) -> None:
+        if backoff:
+            self.open_time = min(self.open_time * 2, self.max_open_time)
+        self.state = OPEN
+        self.opened_at = now
+        _lg.warning(f"Circuit {self.name} opened for {self.open_time}s.")
+
+    def _close(self) -> None:
+        self.state = CLOSED
+        self.open_time = self.base_open_time
+        self._calls.clear()
+        _lg.info(f"Circuit {self.name} closed.")
+
+    def snapshot(self) -> dict[str, Any]:
+        """State, error rate and latency percentiles of the window."""
+        self._trim(time.monotonic())
+        calls = len(self._calls)
+        latencies = sorted(lat for _, _, lat in self._calls)
+        return {
+            "state": self.state,
+            "calls": calls,
+            "error_rate": (
+                round(sum(not ok for _, ok, _ in self._calls) / calls, 3)
+                if calls
+                else 0.0
+            ),
+            "p50_ms": round(latencies[calls // 2] * 1000) if calls else None,
+            "p90_ms": round(latencies[int(calls * 0.9)] * 1000) if calls else None,
+            "open_time": self.open_time,
+        }
+
+
+class CircuitBreakers:
+    """Registry of breakers by upstream name, created on first use."""
+
+    def __init__(self, **options: Any):
+        self.options = options
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, **self.options)
+            self._breakers[name] = breaker
+        return breaker
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {name: breaker.snapshot() for name, breaker in self._breakers.items()}
+
+
+provider_breakers = CircuitBreakers(
+    window=settings.CIRCUIT_WINDOW,
+    min_calls=settings.CIRCUIT_MIN_CALLS,
+    error_rate=settings.CIRCUIT_ERROR_RATE,
+    slow_call=settings.CIRCUIT_SLOW_CALL,
+    slow_rate=settings.CIRCUIT_SLOW_RATE,
+    open_time=settings.CIRCUIT_OPEN_TIME,
+    max_open_time=settings.CIRCUIT_MAX_OPEN_TIME,
+    half_open_probes=settings.CIRCUIT_HALF_OPEN_PROBES,
+)
@@ -0,0 +1,161 @@
+import json
+import zlib
+from collections import defaultdict
+from typing import Any
+
+from cachetools import LRUCache
+
+from src.core import get_logger
+
+_lg = get_logger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+# Заголовок значения: [версия схемы][формат][сжатие]
+CODEC_VERSION = 1
+
+FORMAT_JSON = 0
+FORMAT_MSGPACK = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+_FORMATS = {"json": FORMAT_JSON, "msgpack": FORMAT_MSGPACK}
+_COMPRESSIONS = {
+    "none": COMPRESSION_NONE,
+    "zlib": COMPRESSION_ZLIB,
+    "zstd": COMPRESSION_ZSTD,
+}
+
+
+class SizeMetrics:
+    """Sizes of encoded values: totals per key family and last size per key."""
+
+    def __init__(self, max_keys: int = 1024):
+        self.per_key: LRUCache = LRUCache(maxsize=max_keys)
+        self.per_family: dict[str, dict[str, int]] = defaultdict(
+            lambda: {"count": 0, "raw_bytes": 0, "stored_bytes": 0}
+        )
+
+    @staticmethod
+    def family(key: Any) -> str:
+        """Key family: prefix before ":" or "user" for bare user ids."""
+        if isinstance(key, int):
+            return "user"
+        return str(key).split(":", 1)[0]
+
+    def record(self, key: Any, raw_size: int, stored_size: int) -> None:
+        self.per_key[key] = (raw_size, stored_size)
+
+        family = self.per_family[self.family(key)]
+        family["count"] += 1
+        family["raw_bytes"] += raw_size
+        family["stored_bytes"] += stored_size
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "families": {name: dict(stats) for name, stats in self.per_family.items()},
+            "keys": dict(self.per_key.items()),
+        }
+
+
+class Codec:
+    """
+    Versioned codec for cache values. \n
+    JSON (orjson if installed) or msgpack, values above threshold are compressed.
+    """
+
+    def __init__(
+        self,
+        fmt: str = "json",
+        compression: str = "zlib",
+        compress_threshold: int = 1024,
+    ):
+        self.format = _FORMATS.get(fmt, FORMAT_JSON)
+        if self.format == FORMAT_MSGPACK and msgpack is None:
+            _lg.warning("msgpack is not installed, using json codec.")
+            self.format = FORMAT_JSON
+
+        self.compression = _COMPRESSIONS.get(compression, COMPRESSION_ZLIB)
+        if self.compression == COMPRESSION_ZSTD and zstandard is None:
+            _lg.warning("zstandard is not installed, using zlib compression.")
+            self.compression = COMPRESSION_ZLIB
+
+        self.compress_threshold = compress_threshold
+        self.metrics = SizeMetrics()
+
+    def _dumps(self, data: Any) -> bytes:
+        if self.format == FORMAT_MSGPACK:
+            return msgpack.packb(data, use_bin_type=True)  # type: ignore
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+    @staticmethod
+    def _loads(fmt: int, payload: bytes) -> Any:
+        if fmt == FORMAT_MSGPACK:
+            if msgpack is None:
+                raise ValueError("msgpack value, but msgpack is not installed")
+            return msgpack.unpackb(payload, raw=False)
+        if orjson is not None:
+            return orjson.loads(payload)
+        return json.loads(payload)
+
+    def encode(self, data: Any, key: Any = None) -> bytes:
+        """Encode value with header, compress if it is big enough."""
+        payload = self._dumps(data)
+        raw_size = len(payload)
+
+        compression = COMPRESSION_NONE
+        if self.compression != COMPRESSION_NONE and raw_size >= self.compress_threshold:
+            if self.compression == COMPRESSION_ZSTD:
+                compressed = zstandard.ZstdCompressor().compress(payload)  # type: ignore
+            else:
+                compressed = zlib.compress(payload)
+
+            # Сжатие имеет смысл только если стало меньше
+            if len(compressed) < raw_size:
+                payload = compressed
+                compression = self.compression
+
+        encoded = bytes((CODEC_VERSION, self.format, compression)) + payload
+
+        if key is not None:
+            self.metrics.record(key, raw_size, len(encoded))
+
+        return encoded
+
+    def decode(self, data: bytes) -> Any:
+        """
+        Decode value written by encode. \n
+        Values of other versions (e.g. legacy pickle) raise ValueError.
+        """
+        if len(data) < 3 or data[0] != CODEC_VERSION:
+            raise ValueError("Unknown cache value version")
+
+        fmt, compression = data[1], data[2]
+        payload = data[3:]
+
+        if compression == COMPRESSION_ZLIB:
+            payload = zlib.decompress(payload)
+        elif compression == COMPRESSION_ZSTD:
+            if zstandard is None:
+                raise ValueError("zstd value, but zstandard is not installed")
+            payload = zstandard.ZstdDecompressor().decompress(payload)
+
+        return self._loads(fmt, payload)
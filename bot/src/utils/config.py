@@ -6,6 +6,8 @@ class SettingsSchema(BaseSettings):
     TELEGRAM_BOT_TOKEN: str
     # TG WEBHOOK
     TELEGRAM_WEBHOOK_SECRET: str
+    # Токен для /metrics (заголовок X-Metrics-Token), пусто — маршрут выключен
+    METRICS_TOKEN: str = ""
 
     # TUNA TUNNELS
     TUNA_TOKEN: str
@@ -19,6 +21,140 @@ class SettingsSchema(BaseSettings):
     # OpenWeatherMap
     OPEN_WEATHER_MAP_API_KEY: str
 
+    # CACHE CODEC
+    # Формат значений Redis: json или msgpack, сжатие: none, zlib или zstd
+    CACHE_CODEC: str = "json"
+    CACHE_COMPRESSION: str = "zlib"
+    CACHE_COMPRESS_THRESHOLD: int = 1024
+
+    # L1 CACHE
+    # Кеш профилей пользователей в памяти процесса (секунды)
+    CACHE_L1_ENABLED: bool = True
+    CACHE_L1_SIZE: int = 10_000
+    CACHE_L1_TTL: int = 60
+    CACHE_L1_CHANNEL: str = "cache:invalidate"
+
+    # HTTP CLIENT
+    HTTP_LIMIT: int = 100
+    HTTP_LIMIT_PER_HOST: int = 10
+    HTTP_DNS_CACHE_TTL: int = 300
+    HTTP_KEEPALIVE_TIMEOUT: float = 30.0
+    HTTP_DEFAULT_TIMEOUT: float = 10.0
+    HTTP_SERVICE_TIMEOUTS: dict[str, float] = {
+        "OpenMeteo": 5.0,
+        "WeatherAPI": 5.0,
+        "VisualCrossing": 6.0,
+        "YandexParser": 8.0,
+        "Nominatim": 5.0,
+        "Geocoding": 5.0,
+    }
+    # Дублирующий запрос после p90 задержки сервиса, доля дублей от запросов
+    HTTP_HEDGE_SERVICES: list[str] = ["YandexParser"]
+    HTTP_HEDGE_BUDGET: float = 0.1
+    HTTP_HEDGE_MIN_SAMPLES: int = 20
+    HTTP_HEDGE_WINDOW: int = 200
+
+    # GEOCODING CACHE
+    # Шаг сетки для обратного геокодинга (градусы) и TTL (секунды)
+    GEO_GRID_STEP: float = 0.01
+    GEO_CACHE_TTL: int = 30 * 24 * 3600
+    GEO_NEGATIVE_TTL: int = 24 * 3600
+    GEO_L1_SIZE: int = 10_000
+    GEO_L1_TTL: int = 3600
+
+    # YANDEX PARSER
+    # JSON таблица селекторов, пусто — файл рядом с парсером
+    YANDEX_SELECTORS_PATH: str = ""
+    # state — встроенный JSON страницы (с откатом на DOM), dom — разбор разметки
+    YANDEX_EXTRACTOR: str = "state"
+
+    # PARSE EXECUTOR
+    # Разбор HTML вне цикла событий: process или thread, модули для прогрева воркеров
+    PARSE_EXECUTOR: str = "process"
+    PARSE_WORKERS: int = 2
+    PARSE_PRELOAD: list[str] = ["bs4", "lxml", "src.utils.parser"]
+
+    # WEATHER CACHE
+    # Точность geohash ячейки и окно свежести сообщения (секунды)
+    WEATHER_GEOHASH_PRECISION: int = 5
+    WEATHER_CACHE_TTL: int = 3600
+    # Жёсткий TTL: до него устаревшее сообщение отдаётся сразу и обновляется в фоне
+    WEATHER_CACHE_HARD_TTL: int = 5400
+
+    # WEATHER HISTORY
+    # Журнал сообщений погоды для аналитики, партиции по дням (PostgreSQL)
+    WEATHER_HISTORY_ENABLED: bool = False
+    WEATHER_HISTORY_PARTITIONS_AHEAD: int = 2
+    WEATHER_HISTORY_RETENTION_DAYS: int = 30
+
+    # PROVIDER CACHE
+    # TTL нормализованных ответов провайдеров (секунды)
+    PROVIDER_CACHE_TTL: int = 900
+    PROVIDER_CACHE_TTLS: dict[str, int] = {
+        "YandexParser": 600,
+        "OpenMeteo": 900,
+        "WeatherAPI": 900,
+        "VisualCrossing": 1800,
+    }
+
+    # PRE-WARM
+    # Фоновый прогрев погоды для популярных ячеек
+    PREWARM_ENABLED: bool = True
+    PREWARM_LOCALE: str = "ru"
+    PREWARM_INTERVAL: int = 120
+    PREWARM_USERS_SCAN_INTERVAL: int = 3600
+    PREWARM_LEAD: int = 300
+    PREWARM_TOP_CELLS: int = 50
+    PREWARM_CONCURRENCY: int = 2
+    PREWARM_CALL_INTERVAL: float = 1.0
+
+    # WRITE-BEHIND
+    # Пакетная запись пользователей в БД: размер пачки и период (секунды)
+    WRITE_BEHIND_ENABLED: bool = True
+    WRITE_BEHIND_BATCH_SIZE: int = 200
+    WRITE_BEHIND_FLUSH_INTERVAL: float = 1.0
+    # Попыток записи строки до её удаления из очереди
+    WRITE_BEHIND_MAX_ATTEMPTS: int = 5
+
+    # SINGLE-FLIGHT
+    # Время жизни Redis-лока и ожидания чужого вычисления (секунды)
+    SINGLE_FLIGHT_LOCK_TIMEOUT: int = 30
+    SINGLE_FLIGHT_WAIT_TIMEOUT: float = 15.0
+
+    # RATE LIMITS
+    # Токены в секунду и размер корзины по хосту, суточные квоты (UTC)
+    RATE_LIMITS: dict[str, list[float]] = {
+        "nominatim.openstreetmap.org": [1.0, 1],
+        "api.weatherapi.com": [5.0, 10],
+        "weather.visualcrossing.com": [2.0, 5],
+        "yandex.ru": [2.0, 5],
+    }
+    RATE_LIMIT_MAX_WAIT: float = 2.0
+    DAILY_QUOTAS: dict[str, int] = {
+        "weather.visualcrossing.com": 1000,
+        "api.weatherapi.com": 30_000,
+    }
+    # Равномерный расход квоты в течение суток, доля квоты доступная сразу
+    QUOTA_PACING: bool = True
+    QUOTA_BURST_SHARE: float = 0.1
+
+    # CIRCUIT BREAKER
+    # Окно статистики провайдера, пороги ошибок и медленных ответов (секунды)
+    CIRCUIT_WINDOW: float = 60.0
+    CIRCUIT_MIN_CALLS: int = 5
+    CIRCUIT_ERROR_RATE: float = 0.5
+    CIRCUIT_SLOW_CALL: float = 3.0
+    CIRCUIT_SLOW_RATE: float = 0.8
+    CIRCUIT_OPEN_TIME: float = 30.0
+    CIRCUIT_MAX_OPEN_TIME: float = 300.0
+    CIRCUIT_HALF_OPEN_PROBES: int = 1
+
+    # WEATHER FAN-OUT
+    # Дедлайн одного провайдера и общий бюджет на "Сейчас" (секунды)
+    WEATHER_PROVIDER_DEADLINE: float = 5.0
+    WEATHER_PROVIDER_DEADLINES: dict[str, float] = {}
+    WEATHER_FANOUT_BUDGET: float = 6.0
+
     # Pydantic settings
     model_config = SettingsConfigDict(env_file=".env", extra="allow")
 
@@ -7,16 +7,17 @@ if __name__ == "__main__":
     bot_dir = Path(__file__).parent.parent.parent
     sys.path.insert(0, str(bot_dir))
 
-from typing import Type, Any, TypeVar
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Type, TypeVar
 
 from aiogram.types import User
 
-from sqlalchemy import inspect, exists, select, func
+from sqlalchemy import bindparam, exists, select, func, text, update
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
 from src.core import get_logger
-from src.utils import RedisCache
+from src.utils import RedisCache, settings
 
 # TypeVar для generic типизации
 T = TypeVar("T", bound=DeclarativeBase)
@@ -51,6 +52,11 @@ class MethodsOfDatabase:
         self.engine = engine
         self.cache = RedisCache()  # Создаём, но не подключаемся
 
+    @staticmethod
+    def user_key(user_id: int) -> str:
+        """Redis hash key of user profile."""
+        return f"user:{user_id}"
+
     def _get_session(self) -> AsyncSession:
         """
         Create new database session
@@ -64,28 +70,14 @@ class MethodsOfDatabase:
         """Create all database tables if they don't exist"""
         async with self.engine.begin() as conn:
             try:
-                from src.database.models import UserAllInfo, WeatherAllInfo  # noqa: F401 # нужно для правильного создания таблиц
-
-                def get_existing_tables(sync_conn):
-                    return inspect(sync_conn).get_table_names()
-
-                def create_all_tables(sync_conn):
-                    return self.base.metadata.create_all(sync_conn)
-
-                existing_tables = await conn.run_sync(get_existing_tables)
-
-                if existing_tables:
-                    self._lg.debug(f"Found existing tables: {existing_tables}.")
-                else:
-                    self._lg.debug("No existing tables found, creating...")
-
-                # Создаём таблицы
-                await conn.run_sync(create_all_tables)
+                from src.database.models import UserAllInfo, WeatherAllInfo, WeatherHistory  # noqa: F401 # нужно для правильного создания таблиц
 
-                # Проверяем
-                new_tables = await conn.run_sync(get_existing_tables)
-                self._lg.debug(f"Database tables ready: {new_tables}.")
+                # Один проход: create_all сам проверяет существование таблиц
+                await conn.run_sync(self.base.metadata.create_all, checkfirst=True)
 
+                self._lg.debug(
+                    f"Database tables ready: {list(self.base.metadata.tables)}."
+                )
                 return True
 
             except Exception as e:
@@ -97,6 +89,12 @@ class MethodsOfDatabase:
         try:
             await self.cache.connect()  # type: ignore
             self._lg.info("Redis cache initialized")
+
+            if settings.CACHE_L1_ENABLED:
+                await self.cache.enable_l1(  # type: ignore
+                    maxsize=settings.CACHE_L1_SIZE,
+                    ttl=settings.CACHE_L1_TTL,
+                )
         except Exception as e:
             self._lg.error(f"Failed to initialize Redis cache: {e}")
             # Можно продолжить без кэша
@@ -129,48 +127,38 @@ class MethodsOfDatabase:
         """
         async with self._get_session() as session:
             try:
-                # Проверка на существование
-                user_id = user.id if user else kwargs.get("user_id")
-
-                # Оптимизированная проверка через EXISTS
-                if user_id:
-                    exists_stmt = select(exists().where(model.user_id == user_id))  # type: ignore
-                    user_exists = await session.scalar(exists_stmt)
-
-                    if user_exists:
-                        self._lg.debug(f"User {user_id} already exists.")
-                        return False, f"User {user_id} already exists."
-
                 # Подготовка данных из User объекта
                 data = {}
                 if user is not None:
-                    data = {
-                        "user_id": user.id,
-                        "is_bot": user.is_bot,
-                        "is_premium": user.is_premium,
-                        "language_code": user.language_code,
-                        "supports_inline_queries": getattr(
-                            user, "supports_inline_queries", False
-                        ),
-                        "username": user.username,
-                        "first_name": user.first_name,
-                        "last_name": user.last_name,
-                    }
+                    data = self.telegram_user_data(user)
 
                 # Добавляем/перезаписываем дополнительными параметрами
                 data.update(kwargs)
-
-                # Создание записи
-                new_user = model(**data)
-                session.add(new_user)
+                user_id = data.get("user_id")
+
+                # Один INSERT ... ON CONFLICT DO NOTHING RETURNING вместо EXISTS + INSERT
+                insert = self._dialect_insert(session)
+                stmt = (
+                    insert(model)
+                    .values(**data)
+                    .on_conflict_do_nothing(index_elements=["user_id"])
+                    .returning(model.id)  # type: ignore
+                )
+                new_id = await session.scalar(stmt)
                 await session.commit()
-                await session.refresh(new_user)
+
+                if new_id is None:
+                    self._lg.debug(f"User {user_id} already exists.")
+                    return False, f"User {user_id} already exists."
 
                 # Redis cache
-                await self.cache.set(key=user_id, data=data)  # type: ignore
+                if self.cache:
+                    await self.cache.hset_fields(
+                        self.user_key(user_id), {"id": new_id, **data}  # type: ignore
+                    )
 
-                self._lg.debug(f"User created: {new_user.user_id}.")  # type: ignore
-                return True, f"User {new_user.user_id} created successfully."  # type: ignore
+                self._lg.debug(f"User created: {user_id}.")
+                return True, f"User {user_id} created successfully."
 
             except Exception as e:
                 await session.rollback()
@@ -211,7 +199,8 @@ class MethodsOfDatabase:
                 await session.commit()
 
                 # Redis cache
-                await self.cache.delete(key=user_id)  # type: ignore
+                if self.cache:
+                    await self.cache.delete(key=self.user_key(user_id))
 
                 self._lg.debug(f"User deleted: {user_id} ({username}).")
                 return True, f"User {user_id} deleted successfully."
@@ -246,6 +235,18 @@ class MethodsOfDatabase:
                 city="Moscow"
             )
         """
+        if not kwargs:
+            self._lg.warning("No fields provided for update.")
+            return False, "No fields to update.", None
+
+        # Из кеша читаем только обновляемые поля
+        if self.cache:
+            cached_fields = await self.cache.hget_fields(
+                self.user_key(user_id), list(kwargs)
+            )
+            if cached_fields is not None and cached_fields == kwargs:
+                return True, "No changes detected.", {}
+
         async with self._get_session() as session:
             try:
                 # Находим пользователя
@@ -257,10 +258,6 @@ class MethodsOfDatabase:
                     self._lg.warning(f"User {user_id} not found for update.")
                     return False, f"User {user_id} not found.", None
 
-                if not kwargs:
-                    self._lg.warning("No fields provided for update.")
-                    return False, "No fields to update.", None
-
                 updated_fields = {}
                 invalid_fields = []
 
@@ -281,10 +278,15 @@ class MethodsOfDatabase:
                     return True, "No changes detected.", {}
 
                 await session.commit()
-                await session.refresh(user)
 
-                # Redis cache
-                await self.cache.update(user_id, updated_fields)  # type: ignore
+                # Redis cache, атомарно и только изменённые поля
+                if self.cache:
+                    new_values = {
+                        key: changes["new"] for key, changes in updated_fields.items()
+                    }
+                    await self.cache.hupdate_if_exists(
+                        self.user_key(user_id), new_values
+                    )
 
                 self._lg.debug(
                     f"User {user_id} updated: {list(updated_fields.keys())}."
@@ -296,6 +298,80 @@ class MethodsOfDatabase:
                 self._lg.error(f"Failed to update user {user_id}: {e}.", exc_info=True)
                 return False, f"Error: {str(e)}", None
 
+    async def upsert_users_batch(
+        self,
+        model: Type[T],
+        rows: dict[int, dict[str, Any]],
+        raise_errors: bool = False,
+    ) -> tuple[bool, str]:
+        """
+        Create or update many users in one transaction
+
+        Args:
+            model: Model class
+            rows: Fields to write by Telegram user ID
+            raise_errors: Re-raise database error after rollback
+
+        Returns:
+            tuple[bool, str]: (success, message)
+        """
+        if not rows:
+            return True, "Nothing to write."
+
+        # Полные профили — upsert, частичные изменения — UPDATE по user_id
+        upserts: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        updates: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        for user_id, fields in rows.items():
+            fields = {key: value for key, value in fields.items() if hasattr(model, key)}
+            if "first_name" in fields and "is_bot" in fields:
+                row = {**fields, "user_id": user_id}
+                upserts.setdefault(tuple(sorted(row)), []).append(row)
+            elif fields:
+                row = {**fields, "b_user_id": user_id}
+                updates.setdefault(tuple(sorted(fields)), []).append(row)
+
+        async with self._get_session() as session:
+            try:
+                upserted = await self._upsert_user_groups(session, model, upserts)
+
+                table = model.__table__  # type: ignore
+                updated = 0
+                for columns, update_rows in updates.items():
+                    # SET берётся из ключей параметров, совпадающих с колонками
+                    stmt = update(table).where(
+                        table.c.user_id == bindparam("b_user_id")
+                    )
+                    result = await session.execute(stmt, update_rows)
+                    updated += max(result.rowcount, 0)
+
+                await session.commit()
+
+                self._lg.debug(
+                    f"Users batch written: {upserted} upserted, {updated} updated."
+                )
+                return True, f"Upserted {upserted}, updated {updated} users."
+
+            except Exception as e:
+                await session.rollback()
+                self._lg.error(f"Failed to write users batch: {e}.", exc_info=True)
+                if raise_errors:
+                    raise
+                return False, f"Error: {str(e)}"
+
+    @staticmethod
+    def telegram_user_data(user: User) -> dict[str, Any]:
+        """Columns of UserAllInfo from Telegram User object."""
+        return {
+            "user_id": user.id,
+            "is_bot": user.is_bot,
+            "is_premium": user.is_premium,
+            "language_code": user.language_code,
+            "supports_inline_queries": getattr(user, "supports_inline_queries", False),
+            "username": user.username,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+        }
+
     async def user_exists(self, model: Type[T], user_id: int) -> bool:
         """
         Check if user exists in database
@@ -308,7 +384,7 @@ class MethodsOfDatabase:
             bool: True if user exists, False otherwise
         """
         # Проверяем кэш
-        if await self.cache.exists(user_id):  # type: ignore
+        if self.cache and await self.cache.exists(self.user_key(user_id)):
             return True
 
         async with self._get_session() as session:
@@ -334,8 +410,12 @@ class MethodsOfDatabase:
             bool: True if user location exists, False otherwise
         """
         try:
-            # Проверяем кэш
-            cached_data = await self.cache.get(user_id)  # type: ignore
+            # Проверяем кэш, читаем только поля локации
+            cached_data = None
+            if self.cache:
+                cached_data = await self.cache.hget_fields(
+                    self.user_key(user_id), ["city", "latitude", "longitude"]
+                )
 
             if cached_data:
                 self._lg.debug(f"Cached data (deserialized) - {cached_data}")
@@ -406,9 +486,10 @@ class MethodsOfDatabase:
         """
         try:
             # Проверяем кэш
-            cached_data = await self.cache.get(user_id)  # type: ignore
-            if cached_data:
-                return cached_data
+            if self.cache:
+                cached_data = await self.cache.hget_all(self.user_key(user_id))
+                if cached_data:
+                    return cached_data
 
             async with self._get_session() as session:
                 stmt = select(model).where(model.user_id == user_id)  # type: ignore
@@ -425,6 +506,13 @@ class MethodsOfDatabase:
                         column.name: getattr(user, column.name)
                         for column in model.__table__.columns
                     }
+
+                    # Redis cache
+                    if self.cache:
+                        await self.cache.hset_fields(
+                            self.user_key(user_id), result_dict
+                        )
+
                     self._lg.debug(f"User {user_id} found and returned as dict.")
                     return result_dict
                 else:
@@ -440,13 +528,25 @@ class MethodsOfDatabase:
             self._lg.error(f"Error finding user {user_id}: {e}.")
             return None
 
-    async def find_users(  # TODO
+    def _apply_filters(
+        self, stmt: Any, model: Type[T], filters: dict[str, Any] | None
+    ) -> Any:
+        """Add field == value conditions, unknown fields are ignored."""
+        for key, value in (filters or {}).items():
+            if hasattr(model, key):
+                stmt = stmt.where(getattr(model, key) == value)
+            else:
+                self._lg.warning(f"Invalid filter field: {key}.")
+        return stmt
+
+    async def find_users(
         self,
         model: Type[T],
         filters: dict[str, Any] | None = None,
         limit: int = 100,
         offset: int = 0,
         as_dict: bool = True,
+        after_id: int | None = None,
     ) -> list[dict[str, Any]] | list[T]:
         """
         Find multiple users with filters
@@ -455,33 +555,32 @@ class MethodsOfDatabase:
             model: Model class
             filters: Dictionary of field:value pairs for filtering
             limit: Maximum number of results
-            offset: Skip first N results
+            offset: Skip first N results (prefer after_id for big tables)
             as_dict: Return as list of dictionaries
+            after_id: Keyset pagination, return users with id > after_id
 
         Returns:
-            List of users (as dicts or model instances)
+            List of users (as dicts or model instances) ordered by id
 
         Example:
             users = await db.find_users(
                 model=UserAllInfo,
                 filters={"is_premium": True, "language_code": "ru"},
-                limit=50
+                limit=50,
+                after_id=last_page[-1]["id"],
             )
         """
         async with self._get_session() as session:
             try:
-                stmt = select(model)
+                stmt = self._apply_filters(select(model), model, filters)
 
-                # Применяем фильтры
-                if filters:
-                    for key, value in filters.items():
-                        if hasattr(model, key):
-                            stmt = stmt.where(getattr(model, key) == value)
-                        else:
-                            self._lg.warning(f"Invalid filter field: {key}.")
+                # Keyset пагинация по первичному ключу вместо OFFSET
+                if after_id is not None:
+                    stmt = stmt.where(model.id > after_id)  # type: ignore
+                elif offset:
+                    stmt = stmt.offset(offset)
 
-                # Применяем лимиты
-                stmt = stmt.limit(limit).offset(offset)
+                stmt = stmt.order_by(model.id).limit(limit)  # type: ignore
 
                 # Выполняем запрос
                 result = await session.execute(stmt)
@@ -509,7 +608,46 @@ class MethodsOfDatabase:
                 self._lg.error(f"Error finding users: {e}.", exc_info=True)
                 return []
 
-    async def count_users(  # TODO
+    async def iter_users(
+        self,
+        model: Type[T],
+        filters: dict[str, Any] | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Iterate over all users by pages of keyset pagination
+
+        Args:
+            model: Model class
+            filters: Dictionary of field:value pairs for filtering
+            batch_size: Users per page
+
+        Yields:
+            list[dict]: Page of users as dictionaries
+
+        Example:
+            async for users in db.iter_users(model=UserAllInfo, batch_size=500):
+                ...
+        """
+        after_id = None
+        while True:
+            users = await self.find_users(
+                model=model,
+                filters=filters,
+                limit=batch_size,
+                after_id=after_id,
+                as_dict=True,
+            )
+            if not users:
+                return
+
+            yield users  # type: ignore
+
+            if len(users) < batch_size:
+                return
+            after_id = users[-1]["id"]  # type: ignore
+
+    async def count_users(
         self,
         model: Type[T],
         filters: dict[str, Any] | None = None,
@@ -532,12 +670,10 @@ class MethodsOfDatabase:
         """
         async with self._get_session() as session:
             try:
-                stmt = select(func.count(model.id))  # type: ignore
-
-                if filters:
-                    for key, value in filters.items():
-                        if hasattr(model, key):
-                            stmt = stmt.where(getattr(model, key) == value)
+                # COUNT(*) по индексированным колонкам фильтра
+                stmt = self._apply_filters(
+                    select(func.count()).select_from(model), model, filters
+                )
 
                 count = await session.scalar(stmt)
 
@@ -549,20 +685,27 @@ class MethodsOfDatabase:
                 self._lg.error(f"Error counting users: {e}.")
                 return 0
 
-    async def create_many_users(  # TODO
+    async def create_many_users(
         self,
         model: Type[T],
         users_data: list[dict[str, Any]],
+        update_existing: bool = True,
+        batch_size: int = 1000,
     ) -> tuple[int, int, list[str]]:
         """
         Create multiple users at once (batch operation)
 
+        Multi-row INSERT ... ON CONFLICT (user_id) in batches,
+        existing users are updated or skipped.
+
         Args:
             model: Model class
             users_data: List of dictionaries with user data
+            update_existing: Update existing users instead of skipping them
+            batch_size: Rows per INSERT statement
 
         Returns:
-            tuple[int, int, list]: (created_count, failed_count, error_messages)
+            tuple[int, int, list]: (written_count, failed_count, error_messages)
 
         Example:
             created, failed, errors = await db.create_many_users(
@@ -573,238 +716,226 @@ class MethodsOfDatabase:
                 ]
             )
         """
-        async with self._get_session() as session:
-            created = 0
-            failed = 0
-            errors = []
+        # Строки с одинаковым набором колонок пишутся одним INSERT
+        groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        errors = []
+        for user_data in users_data:
+            if not user_data.get("user_id"):
+                errors.append(f"User without user_id skipped: {user_data}")
+                continue
+            groups.setdefault(tuple(sorted(user_data)), []).append(user_data)
 
+        async with self._get_session() as session:
             try:
-                for user_data in users_data:
-                    try:
-                        new_user = model(**user_data)
-                        session.add(new_user)
-                        created += 1
-                    except Exception as e:
-                        error_msg = (
-                            f"Failed to add user {user_data.get('user_id')}: {e}"
-                        )
-                        self._lg.warning(error_msg)
-                        errors.append(error_msg)
-                        failed += 1
-
+                written = await self._upsert_user_groups(
+                    session, model, groups, update_existing, batch_size
+                )
                 await session.commit()
 
+                # Изменённые профили перечитаются из БД
+                if update_existing and self.cache:
+                    await self.cache.delete_many(
+                        [
+                            self.user_key(user["user_id"])
+                            for rows in groups.values()
+                            for user in rows
+                        ]
+                    )
+
                 self._lg.debug(
-                    f"Batch creation: {created} users created, {failed} failed."
+                    f"Batch creation: {written} users written, {len(errors)} failed."
                 )
 
-                return created, failed, errors
+                return written, len(errors), errors
 
             except Exception as e:
                 await session.rollback()
                 self._lg.error(f"Batch creation failed: {e}.", exc_info=True)
                 return 0, len(users_data), [f"Batch error: {str(e)}"]
 
-    async def get_all_user_ids(  # TODO
+    async def _upsert_user_groups(
         self,
+        session: AsyncSession,
         model: Type[T],
-    ) -> list[int]:
-        """
-        Get list of all user IDs
-
-        Args:
-            model: Model class
+        groups: dict[tuple[str, ...], list[dict[str, Any]]],
+        update_existing: bool = True,
+        batch_size: int = 1000,
+    ) -> int:
+        """Multi-row INSERT ... ON CONFLICT (user_id) for rows grouped by columns."""
+        insert = self._dialect_insert(session)
+        written = 0
+
+        for columns, rows in groups.items():
+            # Core INSERT по таблице: executemany и rowcount без ORM bulk
+            stmt = insert(model.__table__)  # type: ignore
+            if update_existing and len(columns) > 1:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["user_id"],
+                    set_={
+                        column: stmt.excluded[column]
+                        for column in columns
+                        if column != "user_id"
+                    },
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=["user_id"])
 
-        Returns:
-            list[int]: List of user IDs
-        """
-        async with self._get_session() as session:
-            try:
-                stmt = select(model.user_id)  # type: ignore
-                result = await session.execute(stmt)
-                user_ids = result.scalars().all()
+            for i in range(0, len(rows), batch_size):
+                result = await session.execute(stmt, rows[i : i + batch_size])
+                written += max(result.rowcount, 0)
 
-                self._lg.debug(f"Retrieved {len(user_ids)} user IDs.")
-                return list(user_ids)
+        return written
 
-            except Exception as e:
-                self._lg.error(f"Error getting user IDs: {e}.")
-                return []
+    @staticmethod
+    def _dialect_insert(session: AsyncSession) -> Any:
+        """INSERT construct with ON CONFLICT support for current dialect."""
+        if session.bind.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert
 
-    # ==== Weather Methods ====
-    async def create_weather_cache(
+    async def iter_user_ids(
         self,
         model: Type[T],
-        weather_id: str,
-        **kwargs: Any,
-    ) -> tuple[bool, str]:
+        batch_size: int = 1000,
+    ) -> AsyncIterator[int]:
         """
-        Create weather cache entry
+        Stream all user IDs through server-side cursor
 
         Args:
-            model: Model class (WeatherAllInfo)
-            weather_id: Unique weather cache identifier
-            **kwargs: Additional fields to set
+            model: Model class
+            batch_size: Rows fetched from cursor at once
 
-        Returns:
-            tuple[bool, str]: (success, message)
+        Yields:
+            int: Telegram user ID
         """
         async with self._get_session() as session:
-            try:
-                if weather_id:
-                    # Проверяем существование
-                    stmt = select(model).where(model.weather_id == weather_id)  # type: ignore
-                    result = await session.execute(stmt)
-                    existing = result.scalar_one_or_none()
+            stmt = (
+                select(model.user_id)  # type: ignore
+                .order_by(model.user_id)  # type: ignore
+                .execution_options(yield_per=batch_size)
+            )
+            result = await session.stream_scalars(stmt)
+            async for user_id in result:
+                yield user_id
 
-                    if existing:
-                        self._lg.debug(f"Weather {weather_id} already exists.")
-                        return False, f"Weather {weather_id} already exists."
+    async def get_all_user_ids(
+        self,
+        model: Type[T],
+    ) -> list[int]:
+        """
+        Get list of all user IDs
 
-                # Подготовка данных
-                data = {"weather_id": weather_id}
-                data.update(kwargs)
+        For big tables prefer iter_user_ids.
 
-                # Создание записи
-                new_weather_cache = model(**data)
-                session.add(new_weather_cache)
-                await session.commit()
-                await session.refresh(new_weather_cache)
+        Args:
+            model: Model class
 
-                # Redis cache
-                await self.cache.set(key=weather_id, data=data)  # type: ignore
+        Returns:
+            list[int]: List of user IDs
+        """
+        try:
+            user_ids = [user_id async for user_id in self.iter_user_ids(model)]
 
-                self._lg.debug(f"Weather created: {new_weather_cache.weather_id}.")  # type: ignore
-                return (
-                    True,
-                    f"Weather {new_weather_cache.weather_id} created successfully.",  # type: ignore
-                )
+            self._lg.debug(f"Retrieved {len(user_ids)} user IDs.")
+            return user_ids
 
-            except Exception as e:
-                await session.rollback()
-                self._lg.error(f"Failed to create weather cache: {e}.", exc_info=True)
-                return False, f"Error: {str(e)}."
+        except Exception as e:
+            self._lg.error(f"Error getting user IDs: {e}.")
+            return []
 
-    async def delete_weather_cache_by_id(
+    # ==== Weather History Methods ====
+    async def append_weather_history(
         self,
         model: Type[T],
         weather_id: str,
-    ) -> tuple[bool, str]:
+        **kwargs: Any,
+    ) -> bool:
         """
-        Delete weather cache by ID
+        Append weather message to history table
 
         Args:
-            model: Model class
+            model: Model class (WeatherHistory)
             weather_id: Weather cache identifier
+            **kwargs: Message columns
 
         Returns:
-            tuple[bool, str]: (success, message)
+            bool: True if row was written
         """
         async with self._get_session() as session:
             try:
-                stmt = select(model).where(model.weather_id == weather_id)  # type: ignore
-                result = await session.execute(stmt)
-                weather_cache = result.scalar_one_or_none()
-
-                if weather_cache is None:
-                    self._lg.warning(f"Weather {weather_id} not found for deletion.")
-                    return False, f"Weather {weather_id} not found."
-
-                await session.delete(weather_cache)
+                table = model.__table__  # type: ignore
+                await session.execute(
+                    table.insert().values(weather_id=weather_id, **kwargs)
+                )
                 await session.commit()
-
-                # Redis cache
-                await self.cache.delete(key=weather_id)  # type: ignore
-
-                self._lg.debug(f"Weather deleted: {weather_id}.")
-                return True, f"Weather {weather_id} deleted successfully."
+                return True
 
             except Exception as e:
                 await session.rollback()
-                self._lg.error(
-                    f"Failed to delete weather cache {weather_id}: {e}.", exc_info=True
-                )
-                return False, f"Error: {str(e)}"
+                self._lg.error(f"Failed to append weather history: {e}.")
+                return False
 
-    async def find_weather_cache_by_id(
+    async def ensure_weather_history_partitions(
         self,
         model: Type[T],
-        weather_id: str,
-        as_dict: bool = True,
-    ) -> T | dict[str, Any] | None:
+        day: date,
+        days_ahead: int = 2,
+        retention_days: int = 30,
+    ) -> bool:
         """
-        Find weather cache by ID
+        Create daily partitions from day to day + days_ahead,
+        drop partitions older than retention_days. PostgreSQL only.
 
         Args:
-            model: Model class
-            weather_id: Weather cache identifier
-            as_dict: Return as dictionary instead of model instance
+            model: Model class (WeatherHistory)
+            day: First day to create partition for
+            days_ahead: Partitions created in advance
+            retention_days: Days of history to keep
 
         Returns:
-            Model instance, dictionary, or None if not found
+            bool: True if partitions are in place
         """
-        try:
-            # Проверяем кэш
-            cached_data = await self.cache.get(weather_id)  # type: ignore
-            if cached_data:
-                return cached_data
-
-            async with self._get_session() as session:
-                stmt = select(model).where(model.weather_id == weather_id)  # type: ignore
-                result = await session.execute(stmt)
-                weather = result.scalar_one_or_none()
-
-                if weather is None:
-                    self._lg.debug(f"Weather {weather_id} not found.")
-                    return None
+        if self.engine.dialect.name != "postgresql":
+            return True
 
-                if as_dict:
-                    # Преобразуем в словарь
-                    result_dict = {
-                        column.name: getattr(weather, column.name)
-                        for column in model.__table__.columns
-                    }
-                    self._lg.debug(f"Weather {weather_id} found and returned as dict.")
-                    return result_dict
-                else:
-                    # Делаем transient
-                    from sqlalchemy.orm import make_transient
+        table = model.__tablename__  # type: ignore
 
-                    make_transient(weather)
-                    self._lg.debug(
-                        f"Weather {weather_id} found and returned as object."
+        try:
+            async with self.engine.begin() as conn:
+                for offset in range(days_ahead + 1):
+                    start = day + timedelta(days=offset)
+                    end = start + timedelta(days=1)
+                    await conn.execute(
+                        text(
+                            f"CREATE TABLE IF NOT EXISTS {table}_{start:%Y%m%d} "
+                            f"PARTITION OF {table} "
+                            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                        )
                     )
-                    return weather
-
-        except Exception as e:
-            self._lg.error(f"Error finding weather {weather_id}: {e}.")
-            return None
-
-    async def weather_cache_exists(self, model: Type[T], weather_id: str) -> bool:
-        """
-        Check if weather cache exists
-
-        Args:
-            model: Model class
-            weather_id: Weather cache identifier
 
-        Returns:
-            bool: True if exists, False otherwise
-        """
-        # Проверяем кэш
-        if await self.cache.exists(weather_id):  # type: ignore
+                # Старые партиции удаляются целиком, без DELETE и bloat
+                result = await conn.execute(
+                    text(
+                        "SELECT c.relname FROM pg_inherits i "
+                        "JOIN pg_class c ON c.oid = i.inhrelid "
+                        "JOIN pg_class p ON p.oid = i.inhparent "
+                        "WHERE p.relname = :table"
+                    ),
+                    {"table": table},
+                )
+                oldest = day - timedelta(days=retention_days)
+                for (partition,) in result:
+                    suffix = partition.removeprefix(f"{table}_")
+                    if suffix.isdigit() and suffix < f"{oldest:%Y%m%d}":
+                        await conn.execute(text(f"DROP TABLE IF EXISTS {partition}"))
+                        self._lg.debug(f"Dropped history partition {partition}.")
             return True
 
-        async with self._get_session() as session:
-            try:
-                # Используем EXISTS
-                stmt = select(exists().where(model.weather_id == weather_id))  # type: ignore
-                result = await session.scalar(stmt)
-                return bool(result)
-
-            except Exception as e:
-                self._lg.error(f"Error checking weather cache existence: {e}.")
-                return False
+        except Exception as e:
+            self._lg.error(f"Failed to maintain history partitions: {e}.")
+            return False
 
     async def close(self) -> None:
         """
@@ -824,6 +955,7 @@ async def get_database_methods(
     session_factory,
     Base: Type[DeclarativeBase],
     engine: AsyncEngine,
+    verify_tables: bool = True,
 ) -> MethodsOfDatabase:
     """
     Factory function to create and initialize MethodsOfDatabase
@@ -832,6 +964,7 @@ async def get_database_methods(
         session_factory: SQLAlchemy async session factory
         base: Declarative base class
         engine: Async database engine
+        verify_tables: Create missing tables before returning
 
     Returns:
         Fully initialized MethodsOfDatabase instance
@@ -840,7 +973,8 @@ async def get_database_methods(
     db_methods = MethodsOfDatabase(session_factory, Base, engine)
 
     # Инициализация таблиц
-    await db_methods.create_tables_and_database()
+    if verify_tables:
+        await db_methods.create_tables_and_database()
 
     # Инициализация кеша дб Redis
     await db_methods.initialize_cache()
@@ -0,0 +1,79 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from src.core import get_logger
+from src.utils.circuit_breaker import CircuitBreakers
+
+_lg = get_logger(__name__)
+
+
+async def _timed(
+    call: Callable[[], Awaitable[Any]], timeout: float
+) -> tuple[Any, float]:
+    started = time.monotonic()
+    result = await asyncio.wait_for(call(), timeout=timeout)
+    return result, time.monotonic() - started
+
+
+async def fan_out(
+    calls: dict[str, Callable[[], Awaitable[Any]]],
+    deadlines: dict[str, float] | None = None,
+    default_deadline: float = 10.0,
+    budget: float | None = None,
+    breakers: CircuitBreakers | None = None,
+) -> dict[str, Any]:
+    """
+    Run all calls concurrently. \n
+    Each call is bounded by its own deadline, the whole fan-out by budget. \n
+    With breakers, calls with open circuit are skipped and every outcome
+    (empty result, error, deadline miss) is recorded to its breaker. \n
+    Returns results of calls finished in time, in the order of calls.
+    """
+    deadlines = deadlines or {}
+    tasks: dict[str, asyncio.Task] = {}
+
+    for name, call in calls.items():
+        if breakers is not None and not breakers.get(name).allow():
+            _lg.debug(f"{name} skipped: circuit is open.")
+            continue
+
+        timeout = deadlines.get(name, default_deadline)
+        tasks[name] = asyncio.create_task(
+            _timed(call, timeout),
+            name=f"fan_out:{name}",
+        )
+
+    if not tasks:
+        return {}
+
+    started = time.monotonic()
+    done, pending = await asyncio.wait(tasks.values(), timeout=budget)
+
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    results = {}
+    for name, task in tasks.items():
+        deadline = deadlines.get(name, default_deadline)
+        success, latency = False, time.monotonic() - started
+
+        if task not in done:
+            _lg.warning(f"{name} cancelled: fan-out budget {budget}s exceeded.")
+        elif isinstance(exc := task.exception(), asyncio.TimeoutError):
+            _lg.warning(f"{name} missed its deadline {deadline}s.")
+            latency = deadline
+        elif exc is not None:
+            _lg.error(f"{name} failed: {exc}")
+        else:
+            result, latency = task.result()
+            results[name] = result
+            success = bool(result)
+
+        if breakers is not None:
+            breakers.get(name).record(success, latency)
+
+    _lg.debug(f"Fan-out answered: {list(results)} of {list(tasks)}.")
+    return results
@@ -0,0 +1,88 @@
+import time
+import zlib
+
+
+def quantize_cord(
+    latitude: str | float,
+    longitude: str | float,
+    step: float = 0.01,
+) -> tuple[str, str]:
+    """
+    Snap coordinates to grid with given step in degrees. \n
+    Returns strings so the result can be used in cache keys.
+    """
+    decimals = max(0, len(f"{step:.10f}".rstrip("0").split(".")[1]))
+
+    lat = round(round(float(latitude) / step) * step, decimals)
+    lon = round(round(float(longitude) / step) * step, decimals)
+
+    return f"{lat:.{decimals}f}", f"{lon:.{decimals}f}"
+
+
+def normalize_city(name_city: str) -> str:
+    """Normalize city name for cache keys."""
+    return " ".join(name_city.split()).casefold().replace("ё", "е")
+
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(
+    latitude: str | float,
+    longitude: str | float,
+    precision: int = 5,
+) -> str:
+    """
+    Encode coordinates to geohash cell. \n
+    Precision 5 is a cell about 4.9 x 4.9 km, 6 is about 1.2 x 0.6 km.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    lat = float(latitude)
+    lon = float(longitude)
+
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(geohash) < precision:
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            geohash.append(_GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+
+def freshness_window(
+    cell: str,
+    ttl: int,
+    now: float | None = None,
+) -> tuple[int, float]:
+    """
+    Returns (index, start) of freshness window for cell. \n
+    Windows are shifted by a stable per-cell phase,
+    so entries of different cells do not expire at the same moment.
+    """
+    if now is None:
+        now = time.time()
+
+    phase = zlib.crc32(cell.encode()) % ttl
+    index = int((now - phase) // ttl)
+    start = index * ttl + phase
+
+    return index, start
@@ -0,0 +1,84 @@
+from typing import Any
+
+from cachetools import TTLCache
+
+from src.core import get_logger
+from src.utils.cache import RedisCache
+from src.utils.config import settings
+from src.utils.geo import normalize_city, quantize_cord
+
+_lg = get_logger(__name__)
+
+# Значение для негативного кеша (город не найден)
+NOT_FOUND = "__not_found__"
+
+
+class GeoCache:
+    """
+    Two-tier geocoding cache: in-process LRU backed by Redis. \n
+    Forward lookups are keyed by normalized city name,
+    reverse lookups by coordinates snapped to grid.
+    """
+
+    def __init__(
+        self,
+        grid_step: float = 0.01,
+        ttl: int = 30 * 24 * 3600,
+        negative_ttl: int = 24 * 3600,
+        l1_size: int = 10_000,
+        l1_ttl: int = 3600,
+    ):
+        self.grid_step = grid_step
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.l1: TTLCache = TTLCache(maxsize=l1_size, ttl=l1_ttl)
+        self.cache: RedisCache | None = None
+
+    def bind(self, cache: RedisCache | None) -> None:
+        """Use Redis connection of repositories as second tier."""
+        self.cache = cache
+
+    def forward_key(self, name_city: str) -> str:
+        return f"geo:fwd:{normalize_city(name_city)}"
+
+    def reverse_key(self, latitude: str | float, longitude: str | float) -> str:
+        lat, lon = quantize_cord(latitude, longitude, self.grid_step)
+        return f"geo:rev:{lat}:{lon}"
+
+    async def get(self, key: str) -> tuple[bool, Any]:
+        """
+        Returns (hit, value). \n
+        Value is None for cached "not found".
+        """
+        value = self.l1.get(key)
+        if value is not None:
+            return True, None if value == NOT_FOUND else value
+
+        if self.cache is None:
+            return False, None
+
+        value = await self.cache.get(key)
+        if value is None:
+            return False, None
+
+        self.l1[key] = value
+        _lg.debug(f"Geo cache hit in Redis: {key}")
+        return True, None if value == NOT_FOUND else value
+
+    async def set(self, key: str, value: Any) -> None:
+        """Cache value, None is cached as "not found" with short TTL."""
+        stored = NOT_FOUND if value is None else value
+        self.l1[key] = stored
+
+        if self.cache is not None:
+            ex = self.negative_ttl if value is None else self.ttl
+            await self.cache.set(key, stored, ex=ex)
+
+
+geo_cache = GeoCache(
+    grid_step=settings.GEO_GRID_STEP,
+    ttl=settings.GEO_CACHE_TTL,
+    negative_ttl=settings.GEO_NEGATIVE_TTL,
+    l1_size=settings.GEO_L1_SIZE,
+    l1_ttl=settings.GEO_L1_TTL,
+)
@@ -0,0 +1,203 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+import aiohttp
+
+from src.core import get_logger
+from src.utils.config import settings
+
+_lg = get_logger(__name__)
+
+
+class LatencyStats:
+    """Recent successful call latencies and hedging counters of one service."""
+
+    def __init__(self, size: int = 200):
+        self.samples: deque[float] = deque(maxlen=size)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def percentile(self, q: float) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+    def count_request(self) -> None:
+        self.requests += 1
+        # Бюджет считается по недавним запросам
+        if self.requests > 10_000:
+            self.requests //= 2
+            self.hedges //= 2
+            self.hedge_wins //= 2
+
+
+class HttpClient:
+    """
+    Application-scoped aiohttp session for all outbound HTTP. \n
+    Keeps TCP/TLS connections and DNS results between requests.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        ttl_dns_cache: int = 300,
+        keepalive_timeout: float = 30.0,
+        default_timeout: float = 10.0,
+        timeouts: dict[str, float] | None = None,
+        hedge_services: list[str] | None = None,
+        hedge_budget: float = 0.1,
+        hedge_min_samples: int = 20,
+        hedge_window: int = 200,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+        self.keepalive_timeout = keepalive_timeout
+        self.default_timeout = default_timeout
+        self.timeouts = timeouts or {}
+        self.hedge_services = set(hedge_services or [])
+        self.hedge_budget = hedge_budget
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_window = hedge_window
+        self._stats: dict[str, LatencyStats] = {}
+        self._session: aiohttp.ClientSession | None = None
+
+    async def start(self) -> None:
+        """Create pooled session. Called once from run_bot."""
+        if self._session is not None and not self._session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.ttl_dns_cache,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.default_timeout),
+        )
+        _lg.info(
+            f"HTTP client started (limit={self.limit}, per_host={self.limit_per_host})."
+        )
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return pooled session, create it lazily for direct module runs."""
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session  # type: ignore
+
+    def get_timeout(self, service: str | None = None) -> aiohttp.ClientTimeout:
+        """Timeout for service from settings or default."""
+        total = self.timeouts.get(service, self.default_timeout)  # type: ignore
+        return aiohttp.ClientTimeout(total=total)
+
+    def get_stats(self, service: str | None) -> LatencyStats:
+        name = service or "default"
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = LatencyStats(self.hedge_window)
+            self._stats[name] = stats
+        return stats
+
+    def _hedge_delay(self, service: str | None, stats: LatencyStats) -> float | None:
+        """Observed p90 of service, None if hedging is off or over budget."""
+        if service not in self.hedge_services:
+            return None
+        if len(stats.samples) < self.hedge_min_samples:
+            return None
+        if stats.hedges >= self.hedge_budget * stats.requests:
+            return None
+        return stats.percentile(0.9)
+
+    async def _timed(self, call: Callable[[], Awaitable[Any]], stats: LatencyStats):
+        started = time.perf_counter()
+        result = await call()
+        stats.samples.append(time.perf_counter() - started)
+        return result
+
+    async def hedge(
+        self,
+        service: str | None,
+        call: Callable[[], Awaitable[Any]],
+        gate: Callable[[], Awaitable[bool]] | None = None,
+    ) -> Any:
+        """
+        Run call, for hedged services fire duplicate after observed p90. \n
+        First successful result wins, the other request is cancelled.
+        Duplicates are limited by hedge_budget share of requests
+        and have to pass gate, it must not block (e.g. try_acquire).
+        """
+        stats = self.get_stats(service)
+        stats.count_request()
+        delay = self._hedge_delay(service, stats)
+
+        primary = asyncio.create_task(self._timed(call, stats))
+        pending = {primary}
+        error: BaseException | None = None
+
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                # Ответ уже пришёл — дубль не нужен и не тратит квоту
+                if not done and (gate is None or await gate()) and not primary.done():
+                    stats.hedges += 1
+                    pending.add(asyncio.create_task(self._timed(call, stats)))
+                    _lg.debug(f"Hedged request to {service} after {delay:.3f}s")
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            stats.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+
+            raise error  # type: ignore
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def get_metrics(self) -> dict[str, dict[str, Any]]:
+        """p50/p90 latency and hedging counters by service."""
+        metrics = {}
+        for service, stats in self._stats.items():
+            p50, p90 = stats.percentile(0.5), stats.percentile(0.9)
+            metrics[service] = {
+                "p50_ms": round(p50 * 1000) if p50 is not None else None,
+                "p90_ms": round(p90 * 1000) if p90 is not None else None,
+                "requests": stats.requests,
+                "hedges": stats.hedges,
+                "hedge_wins": stats.hedge_wins,
+            }
+        return metrics
+
+    async def close(self) -> None:
+        """Close session and connector."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            _lg.info("HTTP client closed.")
+        self._session = None
+
+
+http_client = HttpClient(
+    limit=settings.HTTP_LIMIT,
+    limit_per_host=settings.HTTP_LIMIT_PER_HOST,
+    ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+    keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+    default_timeout=settings.HTTP_DEFAULT_TIMEOUT,
+    timeouts=settings.HTTP_SERVICE_TIMEOUTS,
+    hedge_services=settings.HTTP_HEDGE_SERVICES,
+    hedge_budget=settings.HTTP_HEDGE_BUDGET,
+    hedge_min_samples=settings.HTTP_HEDGE_MIN_SAMPLES,
+    hedge_window=settings.HTTP_HEDGE_WINDOW,
+)
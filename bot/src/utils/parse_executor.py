@@ -0,0 +1,161 @@
+import asyncio
+import importlib
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from src.core import get_logger
+from src.utils.config import settings
+
+_lg = get_logger(__name__)
+
+
+def _warm_up(modules: tuple[str, ...] | list[str]) -> None:
+    """Import parsers in worker before the first task."""
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+
+def _timed_call(fn: Callable[..., Any], *args: Any) -> tuple[float, float, Any]:
+    # Wall clock: время воркера сравнивается со временем отправки в основном процессе
+    started = time.time()
+    result = fn(*args)
+    return started, time.time(), result
+
+
+class ParseStats:
+    """Queue wait and run time of parse tasks."""
+
+    def __init__(self):
+        self.completed = 0
+        self.failed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.parse_total = 0.0
+        self.parse_max = 0.0
+
+    def record(self, wait: float, parse: float) -> None:
+        self.completed += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        self.parse_total += parse
+        self.parse_max = max(self.parse_max, parse)
+
+    def snapshot(self) -> dict[str, Any]:
+        count = self.completed or 1
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait_avg_ms": round(self.wait_total / count * 1000, 3),
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+            "parse_avg_ms": round(self.parse_total / count * 1000, 3),
+            "parse_max_ms": round(self.parse_max * 1000, 3),
+        }
+
+
+class ParseExecutor:
+    """
+    Worker pool for CPU-bound page parsing. \n
+    Keeps event loop free for webhook updates while pages are parsed.
+    Process mode forks workers at start, thread mode shares the GIL
+    but needs no pickling. Functions must be module-level and pure.
+    """
+
+    def __init__(
+        self,
+        mode: str = "process",
+        workers: int = 2,
+        preload: list[str] | None = None,
+    ):
+        self.mode = mode
+        self.workers = workers
+        self.preload = tuple(preload or ())
+        self.in_flight = 0
+        self.stats = ParseStats()
+        self._executor: Executor | None = None
+
+    async def start(self) -> None:
+        """
+        Create pool. Called first in run_bot. \n
+        fork, not spawn: spawn would re-run main.py with Tuna start.
+        """
+        if self._executor is not None:
+            return
+
+        if self.mode == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_warm_up,
+                initargs=(self.preload,),
+            )
+            # Форкаем воркеры сейчас, пока в процессе мало потоков
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor, _warm_up, ()
+            )
+        else:
+            _warm_up(self.preload)
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="parse"
+            )
+
+        _lg.info(f"Parse executor started (mode={self.mode}, workers={self.workers}).")
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) in pool and return its result."""
+        if self._executor is None:
+            await self.start()
+
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        submitted = time.time()
+        self.in_flight += 1
+        try:
+            started, finished, result = await loop.run_in_executor(
+                executor, _timed_call, fn, *args
+            )
+        except BrokenProcessPool as e:
+            # Упавший воркер ломает весь пул, пересоздадим при следующем вызове
+            self.stats.failed += 1
+            if self._executor is executor:
+                _lg.error(f"Parse pool is broken, restarting: {e}")
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)  # type: ignore
+            raise
+        except Exception:
+            self.stats.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+        self.stats.record(max(0.0, started - submitted), finished - started)
+        return result
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Queue depth, in-flight tasks, wait and parse times."""
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - self.workers),
+            **self.stats.snapshot(),
+        }
+
+    async def close(self) -> None:
+        """Stop workers, queued tasks are cancelled."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            _lg.info("Parse executor closed.")
+
+
+parse_executor = ParseExecutor(
+    mode=settings.PARSE_EXECUTOR,
+    workers=settings.PARSE_WORKERS,
+    preload=settings.PARSE_PRELOAD,
+)
@@ -8,33 +8,69 @@ if __name__ == "__main__":
     sys.path.insert(0, str(bot_dir))
 
 import asyncio
+import json
+import re
+from typing import Any
 
-import aiohttp
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from src.core import get_logger
+from src.utils.http_client import http_client
+from src.utils.rate_limiter import RateLimitExceeded, rate_limiter
 
 _lg = get_logger(__name__)
 
+# lxml быстрее, но не обязателен
+try:
+    import lxml  # noqa: F401
+
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# orjson для встроенного JSON состояния страниц
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 async def parse_data(
     url: str | dict,
     params: dict,
     headers: dict | None = None,
-):
-    async with aiohttp.ClientSession(
-        timeout=aiohttp.ClientTimeout(total=10)
-    ) as session:
-        response = await session.get(
+    service: str | None = None,
+) -> str:
+    """
+    Get page text through shared http_client. \n
+    Raises RateLimitExceeded if request is shed by rate limiter.
+    Slow answers are hedged for services from HTTP_HEDGE_SERVICES.
+    """
+    if not await rate_limiter.acquire(url):
+        raise RateLimitExceeded(f"Request to {url} is shed")
+
+    session = await http_client.get_session()
+
+    async def fetch() -> str:
+        async with session.get(
             url,  # type: ignore
             headers=headers,
             params=params,
-        )
-        response.raise_for_status()
+            timeout=http_client.get_timeout(service),
+        ) as response:
+            response.raise_for_status()
+            return await response.text()
 
-        _lg.debug(f"Response is - {bool(await response.text())}")
+    # Дубль запроса тоже тратит токен лимитера
+    text = await http_client.hedge(
+        service, fetch, gate=lambda: rate_limiter.try_acquire(url)
+    )
 
-        return await response.text()
+    _lg.debug(f"Response is - {bool(text)}")
+
+    return text
 
 
 async def get_soup(response):
@@ -47,6 +83,112 @@ async def get_soup(response):
         _lg.debug(f"Internal error: {e}")
 
 
+class SelectorTable:
+    """
+    Field selectors of a page loaded from JSON file. \n
+    Every field is {"tag", "class" regex, "many"}, class regexes
+    match hashed class names by prefix. Optional "state" section
+    describes embedded JSON state. File is reloaded when changed.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.fields: dict[str, tuple[str | None, re.Pattern, bool]] = {}
+        self.strainer: SoupStrainer | None = None
+        self.state: dict[str, Any] = {}
+        self.state_scripts: list[re.Pattern] = []
+        self._mtime: float | None = None
+
+    def load(self) -> "SelectorTable":
+        mtime = self.path.stat().st_mtime
+        if mtime == self._mtime:
+            return self
+
+        table = json.loads(self.path.read_text(encoding="utf-8"))
+        raw = table["fields"]
+        self.fields = {
+            name: (spec.get("tag"), re.compile(spec["class"]), spec.get("many", False))
+            for name, spec in raw.items()
+        }
+        # Парсим только блоки с нужными полями
+        self.strainer = SoupStrainer(
+            class_=re.compile("|".join(f"(?:{spec['class']})" for spec in raw.values()))
+        )
+        self.state = table.get("state", {})
+        self.state_scripts = [
+            re.compile(pattern, re.S) for pattern in self.state.get("scripts", [])
+        ]
+        self._mtime = mtime
+        _lg.info(f"Selectors loaded from {self.path}: {list(self.fields)}")
+        return self
+
+
+def extract_fields(html: str, table: SelectorTable) -> dict[str, Any]:
+    """
+    Texts of table fields from html, missing ones are None. \n
+    Only matched elements are parsed, the rest of the page is skipped.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=table.strainer)
+
+    result: dict[str, Any] = {}
+    for name, (tag, pattern, many) in table.fields.items():
+        if many:
+            result[name] = [el.get_text() for el in soup.find_all(tag, class_=pattern)]
+        else:
+            el = soup.find(tag, class_=pattern)
+            result[name] = el.get_text() if el is not None else None
+    return result
+
+
+def find_state(html: str, patterns: list[re.Pattern]) -> Any | None:
+    """
+    Decoded embedded JSON state of page, None if not found. \n
+    Only script text is decoded, no DOM is built.
+    """
+    for pattern in patterns:
+        match = pattern.search(html)
+        if match is None:
+            continue
+        try:
+            return _json_loads(match.group(1))
+        except ValueError as e:
+            _lg.warning(f"Embedded state is not JSON: {e}")
+    return None
+
+
+def find_by_keys(state: Any, keys: list[str], many: bool = False) -> Any | None:
+    """
+    First dict with all keys in state, in document order. \n
+    With many, first list whose items are such dicts.
+    """
+    stack = [state]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if not many and all(key in node for key in keys):
+                return node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            if (
+                many
+                and node
+                and isinstance(node[0], dict)
+                and all(key in node[0] for key in keys)
+            ):
+                return node
+            stack.extend(reversed(node))
+    return None
+
+
+def get_path(data: Any, path: str) -> Any | None:
+    """Value by dotted path like "parts.day.temp_avg", None if missing."""
+    for key in path.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
 if __name__ == "__main__":
 
     async def main():
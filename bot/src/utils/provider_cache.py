@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any
+
+from src.core import get_logger
+from src.utils.cache import RedisCache
+from src.utils.config import settings
+
+_lg = get_logger(__name__)
+
+
+class ProviderCache:
+    """
+    Cache of normalized provider responses. \n
+    Keyed by provider and grid cell, every provider has its own TTL.
+    """
+
+    def __init__(
+        self,
+        default_ttl: int = 900,
+        ttls: dict[str, int] | None = None,
+    ):
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self.cache: RedisCache | None = None
+
+    def bind(self, cache: RedisCache | None) -> None:
+        """Use Redis connection of repositories."""
+        self.cache = cache
+
+    def key(self, provider: str, cell: str) -> str:
+        # v2: пропуски хранятся как None, без локализованного текста ошибки
+        return f"provider:v2:{provider}:{cell}"
+
+    def get_ttl(self, provider: str) -> int:
+        return self.ttls.get(provider, self.default_ttl)
+
+    async def get_many(self, providers: list[str], cell: str) -> dict[str, Any]:
+        """Cached payloads of providers for cell, missing ones are skipped."""
+        if self.cache is None:
+            return {}
+
+        keys = [self.key(provider, cell) for provider in providers]
+        values = await self.cache.get_many(keys)
+
+        cached = {
+            provider: value
+            for provider, value in zip(providers, values)
+            if value is not None
+        }
+        _lg.debug(f"Provider cache hits for {cell}: {list(cached)}")
+        return cached
+
+    async def set_many(self, payloads: dict[str, Any], cell: str) -> None:
+        """Cache payloads of providers for cell, empty ones are skipped."""
+        if self.cache is None:
+            return
+
+        await asyncio.gather(
+            *(
+                self.cache.set(
+                    self.key(provider, cell), payload, ex=self.get_ttl(provider)
+                )
+                for provider, payload in payloads.items()
+                if payload
+            )
+        )
+
+
+provider_cache = ProviderCache(
+    default_ttl=settings.PROVIDER_CACHE_TTL,
+    ttls=settings.PROVIDER_CACHE_TTLS,
+)
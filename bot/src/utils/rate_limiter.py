@@ -0,0 +1,288 @@
+import asyncio
+import math
+import time
+from datetime import datetime, timezone
+from typing import Any
+from urllib.parse import urlsplit
+
+from src.core import get_logger
+from src.utils.cache import RedisCache
+from src.utils.config import settings
+
+_lg = get_logger(__name__)
+
+_DAY = 24 * 3600
+
+
+class RateLimitExceeded(Exception):
+    """Request is shed by rate limiter or daily quota."""
+
+
+class LocalBucket:
+    """In-process token bucket, used while Redis is unavailable."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def reserve(self, max_wait: float) -> float | None:
+        """Reserve one token, return wait in seconds or None if it is too long."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0
+        if wait > max_wait:
+            return None
+        self.tokens -= 1
+        return wait
+
+    def release(self) -> None:
+        """Return unused token."""
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+class RateLimiter:
+    """
+    Token buckets and daily quotas per upstream host. \n
+    State is shared by replicas in Redis, every replica falls back
+    to its own buckets and counters when Redis is not available.
+    Requests wait for a token up to max_wait, otherwise they are shed.
+    """
+
+    # Корзина может уйти в минус: очередь запросов оплачена заранее
+    _TOKEN_BUCKET = """
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local max_wait = tonumber(ARGV[3])
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or burst
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local wait = 0
+    if tokens < 1 then
+        wait = (1 - tokens) / rate
+    end
+    if wait > max_wait then
+        return -1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil((burst + 1) / rate + max_wait))
+    return math.ceil(wait * 1000)
+    """
+
+    _RELEASE_TOKEN = """
+    local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+    if tokens then
+        redis.call('HSET', KEYS[1], 'tokens', tostring(math.min(tonumber(ARGV[1]), tokens + 1)))
+    end
+    return 1
+    """
+
+    _QUOTA = """
+    local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+    if used >= tonumber(ARGV[1]) then
+        return -1
+    end
+    used = redis.call('INCR', KEYS[1])
+    if used == 1 then
+        redis.call('EXPIRE', KEYS[1], ARGV[2])
+    end
+    return used
+    """
+
+    def __init__(
+        self,
+        rates: dict[str, list[float]] | None = None,
+        quotas: dict[str, int] | None = None,
+        max_wait: float = 2.0,
+        quota_pacing: bool = True,
+        quota_burst_share: float = 0.1,
+    ):
+        self.rates = rates or {}
+        self.quotas = quotas or {}
+        self.max_wait = max_wait
+        self.quota_pacing = quota_pacing
+        self.quota_burst_share = quota_burst_share
+        self.cache: RedisCache | None = None
+        self.shed: dict[str, int] = {}
+        self._buckets: dict[str, LocalBucket] = {}
+        self._local_quota: dict[str, int] = {}
+
+    def bind(self, cache: RedisCache | None) -> None:
+        """Use Redis connection of repositories for shared buckets."""
+        self.cache = cache
+
+    @staticmethod
+    def get_host(url: Any) -> str:
+        return urlsplit(str(url)).hostname or str(url)
+
+    @staticmethod
+    def quota_key(host: str, day: str) -> str:
+        return f"quota:{host}:{day}"
+
+    def allowed_quota(self, host: str, now: datetime) -> int:
+        """
+        Requests allowed for host by now. \n
+        With pacing the daily quota is spread over the day,
+        so it is not burned out before evening.
+        """
+        quota = self.quotas[host]
+        if not self.quota_pacing:
+            return quota
+
+        elapsed = (
+            now - now.replace(hour=0, minute=0, second=0, microsecond=0)
+        ).total_seconds()
+        paced = quota * elapsed / _DAY + quota * self.quota_burst_share
+        return min(quota, math.ceil(paced))
+
+    async def acquire(self, url: Any) -> bool:
+        """
+        Take a token and a quota unit for host of url. \n
+        Waits for a token up to max_wait, returns False if request is shed.
+        """
+        return await self._acquire(url, self.max_wait, count_shed=True)
+
+    async def try_acquire(self, url: Any) -> bool:
+        """
+        Take a token and a quota unit only if a token is free right now. \n
+        For optional requests (hedges), refusal is not counted as shed.
+        """
+        return await self._acquire(url, 0.0, count_shed=False)
+
+    async def _acquire(self, url: Any, max_wait: float, count_shed: bool) -> bool:
+        host = self.get_host(url)
+        if host not in self.rates and host not in self.quotas:
+            return True
+
+        connection = self.cache.connection if self.cache else None
+        wait: float | None = 0.0
+
+        if host in self.rates:
+            wait = await self._reserve_token(connection, host, max_wait)
+            if wait is None:
+                return count_shed and self._shed(host, "rate limit")
+
+        if host in self.quotas and not await self._take_quota(connection, host):
+            # Запрос не уйдёт, токен не должен тормозить следующие
+            if host in self.rates:
+                await self._release_token(connection, host)
+            return count_shed and self._shed(host, "daily quota")
+
+        if wait:
+            _lg.debug(f"Rate limit wait for {host}: {wait:.3f}s")
+            await asyncio.sleep(wait)
+        return True
+
+    async def _reserve_token(
+        self, connection, host: str, max_wait: float
+    ) -> float | None:
+        rate, burst = self.rates[host]
+
+        if connection is not None:
+            try:
+                wait_ms = await connection.eval(
+                    self._TOKEN_BUCKET,
+                    1,
+                    f"ratelimit:{host}",
+                    rate,
+                    burst,
+                    max_wait,
+                )  # type: ignore
+                return None if int(wait_ms) < 0 else int(wait_ms) / 1000
+            except Exception as e:
+                _lg.error(f"Redis rate limiter failed for {host}, using local: {e}")
+
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = LocalBucket(rate, burst)
+            self._buckets[host] = bucket
+        return bucket.reserve(max_wait)
+
+    async def _release_token(self, connection, host: str) -> None:
+        _, burst = self.rates[host]
+
+        if connection is not None:
+            try:
+                await connection.eval(
+                    self._RELEASE_TOKEN, 1, f"ratelimit:{host}", burst
+                )  # type: ignore
+                return
+            except Exception as e:
+                _lg.error(f"Redis rate limiter failed for {host}, using local: {e}")
+
+        bucket = self._buckets.get(host)
+        if bucket is not None:
+            bucket.release()
+
+    async def _take_quota(self, connection, host: str) -> bool:
+        now = datetime.now(timezone.utc)
+        key = self.quota_key(host, now.date().isoformat())
+        allowed = self.allowed_quota(host, now)
+
+        if connection is not None:
+            try:
+                used = await connection.eval(self._QUOTA, 1, key, allowed, 2 * _DAY)  # type: ignore
+                return int(used) >= 0
+            except Exception as e:
+                _lg.error(f"Redis quota failed for {host}, using local: {e}")
+
+        # Счётчики прошлых дней больше не нужны
+        if key not in self._local_quota:
+            self._local_quota = {
+                k: v
+                for k, v in self._local_quota.items()
+                if k.endswith(now.date().isoformat())
+            }
+        used = self._local_quota.get(key, 0)
+        if used >= allowed:
+            return False
+        self._local_quota[key] = used + 1
+        return True
+
+    def _shed(self, host: str, reason: str) -> bool:
+        self.shed[host] = self.shed.get(host, 0) + 1
+        _lg.warning(f"Request to {host} is shed: {reason}.")
+        return False
+
+    async def quota_usage(self) -> dict[str, dict[str, Any]]:
+        """Today's quota usage, paced limit and shed requests of every host."""
+        now = datetime.now(timezone.utc)
+        day = now.date().isoformat()
+        hosts = list(self.quotas)
+        keys = [self.quota_key(host, day) for host in hosts]
+
+        used: list[Any] = [self._local_quota.get(key, 0) for key in keys]
+        connection = self.cache.connection if self.cache else None
+        if connection is not None and keys:
+            try:
+                used = await connection.mget(keys)
+            except Exception as e:
+                _lg.error(f"Internal error: {e}")
+
+        usage = {
+            host: {
+                "used": int(value or 0),
+                "quota": self.quotas[host],
+                "allowed_now": self.allowed_quota(host, now),
+                "shed": self.shed.get(host, 0),
+            }
+            for host, value in zip(hosts, used)
+        }
+        for host in self.rates:
+            usage.setdefault(host, {"shed": self.shed.get(host, 0)})
+        return usage
+
+
+rate_limiter = RateLimiter(
+    rates=settings.RATE_LIMITS,
+    quotas=settings.DAILY_QUOTAS,
+    max_wait=settings.RATE_LIMIT_MAX_WAIT,
+    quota_pacing=settings.QUOTA_PACING,
+    quota_burst_share=settings.QUOTA_BURST_SHARE,
+)
@@ -0,0 +1,115 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from redis.exceptions import LockError
+
+from src.core import get_logger
+from src.utils.cache import RedisCache
+from src.utils.config import settings
+
+_lg = get_logger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent computations of the same key. \n
+    Waiters in this process share one future,
+    replicas are serialized by Redis lock.
+    """
+
+    def __init__(self, lock_timeout: int = 30, wait_timeout: float = 15.0):
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.cache: RedisCache | None = None
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def bind(self, cache: RedisCache | None) -> None:
+        """Use Redis connection of repositories for cross-replica locks."""
+        self.cache = cache
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        recheck: Callable[[], Awaitable[Any]] | None = None,
+    ) -> Any:
+        """
+        Run fn once for all concurrent callers of key. \n
+        recheck is called after the Redis lock is taken,
+        its non-None result is returned instead of running fn.
+        """
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            _lg.debug(f"Waiting for in-flight computation: {key}")
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # Лидер отменён — пробуем сами
+                if inflight.cancelled():
+                    return await self.do(key, fn, recheck)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        try:
+            result = await self._run_locked(key, fn, recheck)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # помечаем как полученное
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _run_locked(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        recheck: Callable[[], Awaitable[Any]] | None,
+    ) -> Any:
+        connection = self.cache.connection if self.cache else None
+        if connection is None:
+            return await fn()
+
+        lock = connection.lock(
+            f"lock:{key}",
+            timeout=self.lock_timeout,
+            blocking_timeout=self.wait_timeout,
+        )
+
+        try:
+            acquired = await lock.acquire()
+        except Exception as e:
+            _lg.error(f"Failed to acquire lock for {key}: {e}")
+            acquired = False
+
+        try:
+            # Другая реплика могла уже всё посчитать
+            if recheck is not None:
+                result = await recheck()
+                if result is not None:
+                    _lg.debug(f"Computed by another replica: {key}")
+                    return result
+
+            if not acquired:
+                _lg.warning(f"Lock wait timeout for {key}, computing anyway.")
+
+            return await fn()
+
+        finally:
+            if acquired:
+                try:
+                    await lock.release()
+                except LockError as e:
+                    _lg.warning(f"Lock for {key} expired before release: {e}")
+
+
+single_flight = SingleFlight(
+    lock_timeout=settings.SINGLE_FLIGHT_LOCK_TIMEOUT,
+    wait_timeout=settings.SINGLE_FLIGHT_WAIT_TIMEOUT,
+)
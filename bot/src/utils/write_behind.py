@@ -0,0 +1,207 @@
+import asyncio
+from typing import Any, Type
+
+from aiogram.types import User
+from sqlalchemy.exc import DataError, IntegrityError
+
+from src.core import get_logger
+from src.utils.config import settings
+from src.utils.db_utils import MethodsOfDatabase
+
+_lg = get_logger(__name__)
+
+
+class UserWriteBehind:
+    """
+    Write-behind queue for user profiles. \n
+    Redis cache is written at once, database gets batched upserts
+    flushed by size or time, pending writes are flushed on close.
+    Rows of failed batches are written one by one, a row rejected
+    by the database max_attempts times is dropped.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_attempts: int = 5,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self._attempts: dict[int, int] = {}
+        self.db_methods: MethodsOfDatabase | None = None
+        self.model: Type | None = None
+        self._pending: dict[int, dict[str, Any]] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def bind(self, db_methods: MethodsOfDatabase, model: Type) -> None:
+        """Use database methods and model of user repository."""
+        self.db_methods = db_methods
+        self.model = model
+
+    async def start(self) -> None:
+        """Start background flusher. Called once from run_bot."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            _lg.info(
+                f"User write-behind started (batch={self.batch_size}, "
+                f"interval={self.flush_interval}s)."
+            )
+
+    async def create(self, user: User, **fields: Any) -> None:
+        """Queue new user from Telegram User object."""
+        data = MethodsOfDatabase.telegram_user_data(user)
+        data.update(fields)
+
+        cache = self.db_methods.cache if self.db_methods else None
+        if cache:
+            await cache.hset_fields(MethodsOfDatabase.user_key(user.id), data)
+
+        await self._enqueue(user.id, data)
+
+    async def update(self, user_id: int, **fields: Any) -> None:
+        """Queue changed fields of user."""
+        if not fields:
+            return
+
+        cache = self.db_methods.cache if self.db_methods else None
+        if cache:
+            await cache.hupdate_if_exists(MethodsOfDatabase.user_key(user_id), fields)
+
+        await self._enqueue(user_id, fields)
+
+    async def _enqueue(self, user_id: int, fields: dict[str, Any]) -> None:
+        self._pending.setdefault(user_id, {}).update(fields)
+
+        # Без фонового потока пишем сразу (например, при прямом запуске модулей)
+        if self._task is None or self._task.done():
+            await self.flush()
+        elif len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> bool:
+        """Write all pending users in one transaction."""
+        async with self._flush_lock:
+            if not self._pending or self.db_methods is None:
+                return True
+
+            batch, self._pending = self._pending, {}
+
+            success, msg = await self.db_methods.upsert_users_batch(
+                model=self.model, rows=batch  # type: ignore
+            )
+
+            if success:
+                written, retry = batch, {}
+                _lg.debug(msg)
+            else:
+                _lg.error(f"Users batch failed: {msg}")
+                written, retry = await self._write_isolated(batch)
+
+                # Возвращаем в очередь, более новые значения важнее
+                for user_id, fields in retry.items():
+                    self._pending[user_id] = {
+                        **fields,
+                        **self._pending.get(user_id, {}),
+                    }
+                if retry:
+                    _lg.error(f"Requeued {len(retry)} user writes.")
+
+            for user_id in written:
+                self._attempts.pop(user_id, None)
+
+            # Кеш мог быть заполнен из БД до записи батча
+            cache = self.db_methods.cache
+            if cache:
+                for user_id, fields in written.items():
+                    # Новые значения уже в очереди и в кеше, старые не пишем
+                    newer = self._pending.get(user_id, {})
+                    fresh = {
+                        key: value for key, value in fields.items() if key not in newer
+                    }
+                    if fresh:
+                        await cache.hupdate_if_exists(
+                            MethodsOfDatabase.user_key(user_id), fresh
+                        )
+
+            return not retry
+
+    async def _write_isolated(
+        self, batch: dict[int, dict[str, Any]]
+    ) -> tuple[dict[int, dict[str, Any]], dict[int, dict[str, Any]]]:
+        """
+        Handle failed batch, returns (written, retry). \n
+        Rows are written one by one, so one bad row does not block the batch.
+        Only row errors are counted, on connection or other database errors
+        the rest of the batch is requeued and nothing is dropped.
+        """
+        written: dict[int, dict[str, Any]] = {}
+        retry: dict[int, dict[str, Any]] = {}
+
+        rows = iter(batch.items())
+        for user_id, fields in rows:
+            try:
+                await self.db_methods.upsert_users_batch(  # type: ignore
+                    model=self.model,  # type: ignore
+                    rows={user_id: fields},
+                    raise_errors=True,
+                )
+            except (IntegrityError, DataError) as e:
+                attempts = self._attempts.get(user_id, 0) + 1
+                if attempts >= self.max_attempts:
+                    self._attempts.pop(user_id, None)
+                    _lg.error(
+                        f"Dropped write of user {user_id} after "
+                        f"{attempts} attempts: {e}"
+                    )
+                else:
+                    self._attempts[user_id] = attempts
+                    retry[user_id] = fields
+                continue
+            except Exception as e:
+                # Скорее всего БД недоступна: ничего не удаляем и попытки не считаем
+                _lg.error(f"Users write failed, database looks unavailable: {e}")
+                retry[user_id] = fields
+                retry.update(rows)
+                break
+
+            written[user_id] = fields
+
+        return written, retry
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                _lg.error(f"Internal error: {e}")
+
+    async def close(self) -> None:
+        """Stop background flusher and write everything still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if not await self.flush():
+            _lg.error(f"Lost {len(self._pending)} pending user writes on shutdown.")
+        _lg.info("User write-behind closed.")
+
+
+user_write_behind = UserWriteBehind(
+    batch_size=settings.WRITE_BEHIND_BATCH_SIZE,
+    flush_interval=settings.WRITE_BEHIND_FLUSH_INTERVAL,
+    max_attempts=settings.WRITE_BEHIND_MAX_ATTEMPTS,
+)